@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from app.core.exceptions import RateLimitError
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def try_consume(self, cost: float) -> float:
+        # Returns 0 when admitted, otherwise the seconds until `cost` tokens are available.
+        self._refill()
+        # A single request larger than the bucket drains it instead of never fitting.
+        cost = min(cost, self.capacity)
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return (cost - self.tokens) / self.refill_per_second
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        max_concurrent: int,
+    ) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_concurrent = max(1, max_concurrent)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._in_flight = 0
+        self.rejected = 0
+
+    def admit(self, client_id: str, cost: float) -> None:
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.capacity, self.refill_per_second)
+                self._buckets[client_id] = bucket
+            wait_seconds = bucket.try_consume(cost)
+            if wait_seconds > 0:
+                self.rejected += 1
+
+        if wait_seconds > 0:
+            raise RateLimitError(
+                f"Quota exceeded for client '{client_id}' (request cost {cost:.1f}).",
+                retry_after=wait_seconds,
+            )
+
+    def refund(self, client_id: str, cost: float) -> None:
+        # Returns the tokens of admitted work that was turned away before it ran.
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is not None:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + cost)
+
+    @contextmanager
+    def forecast_slot(self, wait: bool = False) -> Iterator[None]:
+        # Requests fail fast when saturated; `wait` queues for a slot (for background jobs).
+        if not self._slots.acquire(blocking=wait):
+            with self._lock:
+                self.rejected += 1
+            raise RateLimitError("Forecast capacity is saturated; retry shortly.", retry_after=1)
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrent": self.max_concurrent,
+                "rejected": self.rejected,
+                "clients": {
+                    client_id: round(bucket.tokens, 2)
+                    for client_id, bucket in self._buckets.items()
+                },
+            }
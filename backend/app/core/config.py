@@ -1,8 +1,22 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def _parse_api_keys(raw: str) -> dict[str, str]:
+    # "client-a:key-a,client-b:key-b" -> {"key-a": "client-a", "key-b": "client-b"}
+    keys: dict[str, str] = {}
+    for entry in raw.split(","):
+        client, _, key = entry.strip().rpartition(":")
+        if client and key:
+            keys[key] = client
+    return keys
 
 
 class Settings(BaseModel):
@@ -13,6 +27,111 @@ class Settings(BaseModel):
     api_key: str = Field(
         default_factory=lambda: os.getenv("AGRIPULSE_API_KEY", "agripulse-dev-key")
     )
+    api_keys: dict[str, str] = Field(
+        default_factory=lambda: _parse_api_keys(os.getenv("AGRIPULSE_API_KEYS", ""))
+    )
+    quota_capacity: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_QUOTA_CAPACITY", "60"))
+    )
+    quota_refill_per_second: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_QUOTA_REFILL", "0.5"))
+    )
+    cache_hit_cost: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_CACHE_HIT_COST", "0.1"))
+    )
+    max_concurrent_forecasts: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_MAX_CONCURRENT_FORECASTS", "8"))
+    )
+    serving_mode: Literal["full", "slim"] = Field(
+        default_factory=lambda: os.getenv("AGRIPULSE_SERVING_MODE", "full")
+    )
+    dataset_store_dir: str | None = Field(
+        default_factory=lambda: os.getenv("AGRIPULSE_DATASET_STORE") or None
+    )
+    storage_backend: Literal["memory", "sqlite"] = Field(
+        default_factory=lambda: os.getenv("AGRIPULSE_STORAGE_BACKEND", "memory")
+    )
+    sqlite_path: str = Field(
+        default_factory=lambda: os.getenv(
+            "AGRIPULSE_SQLITE_PATH", str(DATA_DIR / "prices.sqlite3")
+        )
+    )
+    partition_memory_mb: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_PARTITION_MEMORY_MB", "512"))
+    )
+    forecast_routing_enabled: bool = Field(
+        default_factory=lambda: os.getenv("AGRIPULSE_FORECAST_ROUTING", "1") != "0"
+    )
+    routing_light_model: str = Field(
+        default_factory=lambda: os.getenv("AGRIPULSE_ROUTING_LIGHT_MODEL", "holt"),
+        validate_default=True,
+    )
+    forecast_cache_entries: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_FORECAST_CACHE_ENTRIES", "2048"))
+    )
+    forecast_cache_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_FORECAST_CACHE_TTL", "21600"))
+    )
+    fit_deadline_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_FIT_DEADLINE", "10"))
+    )
+    breaker_failures: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_BREAKER_FAILURES", "3"))
+    )
+    breaker_reset_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_BREAKER_RESET", "60"))
+    )
+    warm_top_n: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_WARM_TOP_N", "50"))
+    )
+    warm_interval_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_WARM_INTERVAL", "60"))
+    )
+    warm_lead_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_WARM_LEAD", "600"))
+    )
+    push_poll_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("AGRIPULSE_PUSH_POLL", "30"))
+    )
+    push_max_pairs: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_PUSH_MAX_PAIRS", "50"))
+    )
+    cache_max_age_seconds: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_CACHE_MAX_AGE", "300"))
+    )
+    batch_workers: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_BATCH_WORKERS", "4"))
+    )
+    scheduler_workers: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_SCHEDULER_WORKERS", "4"))
+    )
+    scheduler_max_queued: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_SCHEDULER_MAX_QUEUED", "512"))
+    )
+    job_store_path: str = Field(
+        default_factory=lambda: os.getenv(
+            "AGRIPULSE_JOB_STORE", str(DATA_DIR / "jobs.sqlite3")
+        )
+    )
+    job_workers: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_JOB_WORKERS", "2"))
+    )
+    job_retention_seconds: int = Field(
+        default_factory=lambda: int(os.getenv("AGRIPULSE_JOB_RETENTION", "3600"))
+    )
+
+    @field_validator("routing_light_model")
+    @classmethod
+    def _known_light_model(cls, value: str) -> str:
+        # Checked at startup so a typo fails here, not as a KeyError on the first routed fit.
+        from app.services.model_registry import MODEL_REGISTRY
+
+        if value not in MODEL_REGISTRY:
+            raise ValueError(
+                f"AGRIPULSE_ROUTING_LIGHT_MODEL={value!r} is not a registered model; "
+                f"choose one of: {', '.join(sorted(MODEL_REGISTRY))}."
+            )
+        return value
 
 
 settings = Settings()
@@ -1,30 +1,62 @@
 from __future__ import annotations
 
 import secrets
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Callable
 
 from fastapi import Header
 
+from app.core.admission import AdmissionController
 from app.core.config import settings
 from app.core.exceptions import AuthenticationError, DataNotFoundError, ForecastError
 from app.core.logger import logger
-from app.schemas import ForecastRequest
+from app.services.crop_prices import dataset_version
 from app.services.forecast_pipeline import ForecastPipelineResult, run_forecast_pipeline
+from app.services.jobs import JobManager, JobStore
 from app.services.mandi_compare import select_best_mandis
+from app.services.scheduler import ForecastScheduler, Priority, forecast_scheduler
 
-ForecastService = Callable[[ForecastRequest], ForecastPipelineResult]
+ForecastService = Callable[..., ForecastPipelineResult]
 
 
 def get_forecast_service() -> ForecastService:
     return run_forecast_pipeline
 
 
+def get_forecast_scheduler() -> ForecastScheduler:
+    return forecast_scheduler
+
+
+def get_dataset_version() -> str:
+    try:
+        return dataset_version()
+    except FileNotFoundError as exc:
+        raise DataNotFoundError(str(exc)) from exc
+
+
 def require_api_key(
     x_api_key: str | None = Header(default=None, alias=settings.api_key_header),
-) -> None:
-    if not x_api_key or not secrets.compare_digest(x_api_key, settings.api_key):
-        logger.warning("Unauthorized request blocked due to invalid API key.")
-        raise AuthenticationError("Invalid or missing API key.")
+) -> str:
+    # CHANGED: Returns the client id so quotas can be tracked per API key.
+    if x_api_key:
+        if secrets.compare_digest(x_api_key, settings.api_key):
+            return "default"
+        for key, client_id in settings.api_keys.items():
+            if secrets.compare_digest(x_api_key, key):
+                return client_id
+
+    logger.warning("Unauthorized request blocked due to invalid API key.")
+    raise AuthenticationError("Invalid or missing API key.")
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    return AdmissionController(
+        capacity=settings.quota_capacity,
+        refill_per_second=settings.quota_refill_per_second,
+        max_concurrent=settings.max_concurrent_forecasts,
+    )
 
 
 class MandiComparisonService:
@@ -34,6 +66,8 @@ class MandiComparisonService:
         commodity: str,
         days: int = 7,
         limit: int = 3,
+        on_progress: Callable[[int, int], None] | None = None,
+        priority: Priority = "comparison",
     ) -> dict[str, Any]:
         try:
             return select_best_mandis(
@@ -41,6 +75,8 @@ class MandiComparisonService:
                 commodity=commodity,
                 days=days,
                 limit=limit,
+                on_progress=on_progress,
+                priority=priority,
             )
         except FileNotFoundError as exc:
             raise DataNotFoundError(str(exc)) from exc
@@ -52,3 +88,9 @@ class MandiComparisonService:
 
 def get_mandi_comparison_service() -> MandiComparisonService:
     return MandiComparisonService()
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    store = JobStore(Path(settings.job_store_path), settings.job_retention_seconds)
+    return JobManager(store, workers=settings.job_workers)
@@ -12,3 +12,39 @@ class ForecastError(Exception):
 
 class RecommendationError(ForecastError):
     """Raised when recommendation generation fails."""
+
+
+class UnknownNameError(DataNotFoundError):
+    """Raised when a name matches no dataset label but resembles some."""
+
+    def __init__(self, message: str, candidates: list[str]) -> None:
+        super().__init__(message)
+        self.candidates = candidates
+
+
+class AmbiguousNameError(Exception):
+    """Raised when a partial name matches several dataset labels."""
+
+    def __init__(self, message: str, candidates: list[str]) -> None:
+        super().__init__(message)
+        self.candidates = candidates
+
+
+class AmbiguousMarketError(Exception):
+    """Raised when a market name matches series in several states and no state was given."""
+
+    def __init__(self, message: str, states: list[str]) -> None:
+        super().__init__(message)
+        self.states = states
+
+
+class JobNotReadyError(Exception):
+    """Raised when a job result is requested before the job has finished."""
+
+
+class RateLimitError(Exception):
+    """Raised when a client exceeds its quota or forecast capacity is saturated."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Response
+
+from app.core.config import settings
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag
+
+
+def build_etag(
+    dataset_version: str,
+    scope: str,
+    params: dict[str, Any],
+    media_type: str = "application/json",
+) -> str:
+    # Weak tag: Prophet interval sampling is not bit-for-bit reproducible between fits.
+    canonical = json.dumps(
+        {
+            "dataset": dataset_version,
+            "scope": scope,
+            "params": params,
+            "media_type": media_type,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+
+    expected = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == expected for candidate in candidates if candidate)
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.cache_max_age_seconds}, must-revalidate",
+        "Vary": "Accept",
+    }
+
+
+def uncached_headers() -> dict[str, str]:
+    # Degraded answers must not be revalidated into a cached 304 once the model recovers.
+    return {"Cache-Control": "no-store", "Vary": "Accept"}
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
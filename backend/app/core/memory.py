@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import mmap
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Any
+
+import numpy as np
+
+SNAPSHOTS_KEPT = 4
+_OPAQUE = (type, ModuleType, FunctionType, BuiltinFunctionType, threading.Thread)
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def is_mapped(array: np.ndarray) -> bool:
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, mmap.mmap)
+
+
+def deep_sizeof(value: Any) -> int:
+    # Estimated bytes reachable from `value`, counting shared objects once. Arrays count only
+    # the memory they own, so views and memory-mapped files add little; code is not walked.
+    seen: set[int] = set()
+    pending = [value]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _OPAQUE):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 0)
+
+        if isinstance(item, np.ndarray):
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            attributes = getattr(item, "__dict__", None)
+            if attributes is not None:
+                pending.append(attributes)
+            for name in getattr(type(item), "__slots__", ()):
+                if hasattr(item, name):
+                    pending.append(getattr(item, name))
+    return total
+
+
+def process_memory() -> dict[str, int | None]:
+    # Linux reports current and peak RSS in /proc; other Unixes only the peak, and Windows
+    # (no `resource` module) neither.
+    usage: dict[str, int | None] = {"rss_bytes": None, "peak_rss_bytes": None}
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "VmHWM"):
+                key = "rss_bytes" if name == "VmRSS" else "peak_rss_bytes"
+                usage[key] = int(value.split()[0]) * 1024
+    if usage["peak_rss_bytes"] is None:
+        try:
+            import resource
+        except ImportError:
+            return usage
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    return usage
+
+
+class AllocationTracer:
+    # tracemalloc snapshots taken on demand; the latest few are kept so any two can be diffed.
+    def __init__(self, keep: int = SNAPSHOTS_KEPT) -> None:
+        self.keep = keep
+        self._snapshots: OrderedDict[int, tuple[float, tracemalloc.Snapshot]] = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def snapshot(
+        self,
+        limit: int = 20,
+        compare_to: int | None = None,
+        frames: int = 1,
+    ) -> dict[str, Any]:
+        with self._lock:
+            if compare_to is not None and compare_to not in self._snapshots:
+                raise ValueError(
+                    f"Unknown allocation snapshot {compare_to}; only the latest "
+                    f"{self.keep} are kept."
+                )
+            started = not tracemalloc.is_tracing()
+            if started:
+                # Tracing starts with the first snapshot, so that one only sees later allocations.
+                tracemalloc.start(frames)
+
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self._snapshots) > self.keep:
+                self._snapshots.popitem(last=False)
+
+            traced, peak = tracemalloc.get_traced_memory()
+            # Deeper tracing groups by whole call stack, so callers of one line are told apart.
+            depth = tracemalloc.get_traceback_limit()
+            key_type = "traceback" if depth > 1 else "lineno"
+            result: dict[str, Any] = {
+                "id": snapshot_id,
+                "taken_at": self._snapshots[snapshot_id][0],
+                "tracing_started": started,
+                "traceback_frames": depth,
+                "traced_bytes": traced,
+                "peak_traced_bytes": peak,
+                "top": [
+                    {
+                        **_site(statistic.traceback, key_type),
+                        "size_bytes": statistic.size,
+                        "count": statistic.count,
+                    }
+                    for statistic in snapshot.statistics(key_type)[:limit]
+                ],
+                "compared_to": compare_to,
+                "diff": [],
+            }
+            if compare_to is not None:
+                base = self._snapshots[compare_to][1]
+                result["diff"] = [
+                    {
+                        **_site(difference.traceback, key_type),
+                        "size_bytes": difference.size,
+                        "size_diff_bytes": difference.size_diff,
+                        "count": difference.count,
+                        "count_diff": difference.count_diff,
+                    }
+                    for difference in snapshot.compare_to(base, key_type)[:limit]
+                ]
+            return result
+
+    def snapshot_ids(self) -> list[int]:
+        with self._lock:
+            return list(self._snapshots)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def _site(traceback: tracemalloc.Traceback, key_type: str) -> dict[str, Any]:
+    # Traceback frames run oldest first; the allocating line is the last one.
+    stack = [f"{frame.filename}:{frame.lineno}" for frame in reversed(traceback)]
+    if key_type == "lineno":
+        return {"location": stack[0]}
+    return {"location": stack[0], "stack": stack}
+
+
+allocation_tracer = AllocationTracer()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+_JSON_RANGES = (JSON_MEDIA_TYPE, "application/*", "*/*")
+
+# Advertised in OpenAPI for endpoints rendered through `render_model`.
+BINARY_RESPONSE_DOCS: dict[int | str, dict[str, Any]] = {
+    200: {"content": {MSGPACK_MEDIA_TYPES[0]: {}}},
+}
+
+
+def _msgpack():
+    try:
+        return import_module("msgpack")
+    except ModuleNotFoundError:
+        return None
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return max(0.0, min(1.0, float(value)))
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    if not accept or _msgpack() is None:
+        return JSON_MEDIA_TYPE
+
+    best_type = JSON_MEDIA_TYPE
+    best_rank = (-1.0, 0)
+    for part in accept.split(","):
+        media, _, params = part.strip().partition(";")
+        media = media.strip().lower()
+        if media in MSGPACK_MEDIA_TYPES:
+            candidate, specificity = media, 1
+        elif media in _JSON_RANGES:
+            candidate, specificity = JSON_MEDIA_TYPE, int(media == JSON_MEDIA_TYPE)
+        else:
+            continue
+
+        quality = _quality(params)
+        if quality <= 0:
+            continue
+        rank = (quality, specificity)
+        if rank > best_rank:
+            best_type, best_rank = candidate, rank
+
+    return best_type
+
+
+def render_model(
+    model: BaseModel,
+    media_type: str = JSON_MEDIA_TYPE,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    # CHANGED: Serialize once via pydantic-core instead of re-validating through response_model.
+    if media_type in MSGPACK_MEDIA_TYPES:
+        msgpack = _msgpack()
+        if msgpack is not None:
+            body = msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+            return Response(content=body, media_type=media_type, headers=headers)
+
+    return Response(
+        content=model.model_dump_json(),
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
@@ -1,24 +1,93 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import math
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
 from time import perf_counter
 from typing import Annotated
 
-from fastapi import Depends, FastAPI, Request
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import JSONResponse, RedirectResponse
 
+from app.core.admission import AdmissionController
 from app.core.config import settings
 from app.core.dependencies import (
     ForecastService,
     MandiComparisonService,
+    get_admission_controller,
+    get_dataset_version,
+    get_forecast_scheduler,
     get_forecast_service,
+    get_job_manager,
     get_mandi_comparison_service,
     require_api_key,
 )
-from app.core.exceptions import AuthenticationError, DataNotFoundError, ForecastError
+from app.core.exceptions import (
+    AmbiguousMarketError,
+    AmbiguousNameError,
+    AuthenticationError,
+    DataNotFoundError,
+    ForecastError,
+    JobNotReadyError,
+    RateLimitError,
+)
+from app.core.http_cache import (
+    build_etag,
+    cache_headers,
+    etag_matches,
+    not_modified_response,
+    uncached_headers,
+)
 from app.core.logger import logger
-from app.schemas import ForecastRequest, ForecastResponse
+from app.core.memory import allocation_tracer
+from app.core.responses import BINARY_RESPONSE_DOCS, negotiate_media_type, render_model
+from app.schemas import (
+    BatchForecastItem,
+    BatchForecastRequest,
+    BatchForecastResponse,
+    BestMandiRequest,
+    BestMandiResponse,
+    ForecastRequest,
+    ForecastResponse,
+    HistoryResponse,
+    JobProgress,
+    JobStatus,
+    PriceIndexResponse,
+    SuggestResponse,
+)
+from app.services.cache_warming import cache_warmer
+from app.services.circuit_breaker import fit_breakers
+from app.services.crop_prices import regional_price_index, resolve_name, suggest_names
+from app.services.diagnostics import memory_report
+from app.services.jobs import JobManager, JobRecord, ProgressCallback
+from app.services.name_index import NameKind
+from app.services.price_history import Downsample, query_price_history
+from app.services.price_updates import log_task_failure, price_update_hub
+from app.services.scheduler import ForecastScheduler
+from app.services.workload import estimate_best_mandi_cost, estimate_forecast_cost
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    cache_warmer.start()
+    yield
+    cache_warmer.stop()
+
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
+app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
 
 
 @app.middleware("http")
@@ -65,12 +134,50 @@ async def forecast_exception_handler(_: Request, exc: ForecastError) -> JSONResp
     return JSONResponse(status_code=422, content={"detail": str(exc)})
 
 
+@app.exception_handler(AmbiguousMarketError)
+async def ambiguous_market_exception_handler(
+    _: Request, exc: AmbiguousMarketError
+) -> JSONResponse:
+    return JSONResponse(status_code=409, content={"detail": str(exc), "states": exc.states})
+
+
+@app.exception_handler(AmbiguousNameError)
+async def ambiguous_name_exception_handler(_: Request, exc: AmbiguousNameError) -> JSONResponse:
+    return JSONResponse(
+        status_code=409, content={"detail": str(exc), "candidates": exc.candidates}
+    )
+
+
+@app.exception_handler(JobNotReadyError)
+async def job_not_ready_exception_handler(_: Request, exc: JobNotReadyError) -> JSONResponse:
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+@app.exception_handler(RateLimitError)
+async def rate_limit_exception_handler(_: Request, exc: RateLimitError) -> JSONResponse:
+    logger.warning("Request throttled: %s", exc)
+    retry_after = max(1, math.ceil(min(exc.retry_after, 86400)))
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 @app.exception_handler(Exception)
 async def generic_exception_handler(_: Request, exc: Exception) -> JSONResponse:
     logger.exception("Unhandled server error: %s", exc)
     return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
+def _etag_name(kind: NameKind, value: str | None) -> str | None:
+    # ETags key on canonical labels, so "wheat"/"khanna" and "Wheat"/"Khanna" share a validator.
+    try:
+        return resolve_name(kind, value)
+    except (FileNotFoundError, RuntimeError, ValueError):
+        return value
+
+
 @app.get("/")
 def root() -> RedirectResponse:
     return RedirectResponse(url="/docs")
@@ -78,32 +185,462 @@ def root() -> RedirectResponse:
 
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok", "service": settings.app_name}
+    return {
+        "status": "ok",
+        "service": settings.app_name,
+        "serving_mode": settings.serving_mode,
+    }
 
 
-@app.post("/forecast", response_model=ForecastResponse)
-async def forecast(
+@app.post("/forecast", response_model=ForecastResponse, responses=BINARY_RESPONSE_DOCS)
+def forecast(
     payload: ForecastRequest,
-    _: Annotated[None, Depends(require_api_key)],
+    client_id: Annotated[str, Depends(require_api_key)],
     run_forecast_pipeline: Annotated[ForecastService, Depends(get_forecast_service)],
-) -> ForecastResponse:
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    dataset_version: Annotated[str, Depends(get_dataset_version)],
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
     # CHANGED: Thin controller, delegates business logic to forecast pipeline service.
-    result = run_forecast_pipeline(payload)
-    return ForecastResponse(**result)
+    media_type = negotiate_media_type(accept)
+    etag = build_etag(
+        dataset_version,
+        "forecast",
+        {
+            **payload.model_dump(mode="json"),
+            "crop": _etag_name("commodity", payload.crop),
+            "mandi": _etag_name("market", payload.mandi),
+        },
+        media_type=media_type,
+    )
+    if etag_matches(if_none_match, etag):
+        admission.admit(client_id, settings.cache_hit_cost)
+        return not_modified_response(etag)
+
+    # The slot is taken first, so a request turned away at the ceiling spends no quota.
+    with admission.forecast_slot():
+        admission.admit(client_id, estimate_forecast_cost(payload.crop, payload.mandi))
+        result = run_forecast_pipeline(payload)
+    return render_model(
+        ForecastResponse.model_validate(result),
+        media_type=media_type,
+        headers=uncached_headers() if result["degraded"] else cache_headers(etag),
+    )
 
 
-@app.get("/best-mandi")
-async def best_mandi(
+@app.post(
+    "/forecast/batch",
+    response_model=BatchForecastResponse,
+    responses=BINARY_RESPONSE_DOCS,
+)
+def forecast_batch(
+    payload: BatchForecastRequest,
+    client_id: Annotated[str, Depends(require_api_key)],
+    run_forecast_pipeline: Annotated[ForecastService, Depends(get_forecast_service)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    # One round trip for dashboards; per-item failures do not fail the batch.
+    # Each item holds its own forecast slot, so a batch counts against the ceiling per worker.
+    # Items that find no free slot get their share of the batch's quota back.
+    def run(item: ForecastRequest, cost: float) -> BatchForecastItem:
+        try:
+            with admission.forecast_slot():
+                data = ForecastResponse.model_validate(
+                    run_forecast_pipeline(item, priority="comparison")
+                )
+        except RateLimitError as exc:
+            admission.refund(client_id, cost)
+            status, detail = 429, str(exc)
+        except DataNotFoundError as exc:
+            status, detail = 404, str(exc)
+        except AmbiguousNameError as exc:
+            status, detail = 409, str(exc)
+        except ForecastError as exc:
+            status, detail = 422, str(exc)
+        else:
+            return BatchForecastItem(crop=item.crop, mandi=item.mandi, status=200, data=data)
+        logger.warning("Batch item failed | crop=%s | mandi=%s | %s", item.crop, item.mandi, detail)
+        return BatchForecastItem(crop=item.crop, mandi=item.mandi, status=status, detail=detail)
+
+    costs = [estimate_forecast_cost(item.crop, item.mandi) for item in payload.items]
+    admission.admit(client_id, sum(costs))
+    workers = max(1, min(settings.batch_workers, admission.max_concurrent, len(payload.items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agripulse-batch") as pool:
+        results = list(pool.map(run, payload.items, costs))
+
+    return render_model(
+        BatchForecastResponse(results=results),
+        media_type=negotiate_media_type(accept),
+    )
+
+
+@app.get("/best-mandi", response_model=BestMandiResponse, responses=BINARY_RESPONSE_DOCS)
+def best_mandi(
     state: str,
     commodity: str,
-    _: Annotated[None, Depends(require_api_key)],
+    client_id: Annotated[str, Depends(require_api_key)],
     mandi_service: Annotated[MandiComparisonService, Depends(get_mandi_comparison_service)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    dataset_version: Annotated[str, Depends(get_dataset_version)],
     days: int = 7,
     limit: int = 3,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    media_type = negotiate_media_type(accept)
+    etag = build_etag(
+        dataset_version,
+        "best-mandi",
+        {
+            "state": _etag_name("state", state),
+            "commodity": _etag_name("commodity", commodity),
+            "days": days,
+            "limit": limit,
+        },
+        media_type=media_type,
+    )
+    if etag_matches(if_none_match, etag):
+        admission.admit(client_id, settings.cache_hit_cost)
+        return not_modified_response(etag)
+
+    with admission.forecast_slot():
+        admission.admit(client_id, estimate_best_mandi_cost(state, commodity))
+        result = mandi_service.select_best(
+            state=state,
+            commodity=commodity,
+            days=days,
+            limit=limit,
+        )
+    return render_model(
+        BestMandiResponse.model_validate(result),
+        media_type=media_type,
+        # A ranking missing markets whose fits failed must not be revalidated as complete.
+        headers=uncached_headers() if result["failed_markets"] else cache_headers(etag),
+    )
+
+
+@app.get("/price-index", response_model=PriceIndexResponse, responses=BINARY_RESPONSE_DOCS)
+def price_index(
+    commodity: str,
+    client_id: Annotated[str, Depends(require_api_key)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    dataset_version: Annotated[str, Depends(get_dataset_version)],
+    state: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    # Daily state (or national, without `state`) aggregates precomputed at dataset load.
+    media_type = negotiate_media_type(accept)
+    etag = build_etag(
+        dataset_version,
+        "price-index",
+        {
+            "commodity": _etag_name("commodity", commodity),
+            "state": _etag_name("state", state),
+            "start": start,
+            "end": end,
+        },
+        media_type=media_type,
+    )
+    admission.admit(client_id, settings.cache_hit_cost)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    try:
+        result = regional_price_index(commodity=commodity, state=state, start=start, end=end)
+    except ValueError as exc:
+        raise DataNotFoundError(str(exc)) from exc
+    except RuntimeError as exc:
+        raise ForecastError(str(exc)) from exc
+    return render_model(
+        PriceIndexResponse.model_validate(result),
+        media_type=media_type,
+        headers=cache_headers(etag),
+    )
+
+
+@app.get("/history", response_model=HistoryResponse, responses=BINARY_RESPONSE_DOCS)
+def history(
+    crop: str,
+    mandi: str,
+    client_id: Annotated[str, Depends(require_api_key)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    dataset_version: Annotated[str, Depends(get_dataset_version)],
+    state: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    downsample: Downsample | None = None,
+    points: Annotated[int, Query(ge=3, le=5000)] = 500,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    media_type = negotiate_media_type(accept)
+    etag = build_etag(
+        dataset_version,
+        "history",
+        {
+            "crop": _etag_name("commodity", crop),
+            "mandi": _etag_name("market", mandi),
+            "state": _etag_name("state", state),
+            "start": start,
+            "end": end,
+            "downsample": downsample,
+            "points": points,
+        },
+        media_type=media_type,
+    )
+    admission.admit(client_id, settings.cache_hit_cost)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    try:
+        result = query_price_history(
+            crop=crop,
+            mandi=mandi,
+            state=state,
+            start=start,
+            end=end,
+            downsample=downsample,
+            points=points,
+        )
+    except ValueError as exc:
+        raise DataNotFoundError(str(exc)) from exc
+    except RuntimeError as exc:
+        raise ForecastError(str(exc)) from exc
+    return render_model(
+        HistoryResponse.model_validate(result),
+        media_type=media_type,
+        headers=cache_headers(etag),
+    )
+
+
+@app.get("/suggest", response_model=SuggestResponse, responses=BINARY_RESPONSE_DOCS)
+def suggest(
+    q: str,
+    _: Annotated[str, Depends(require_api_key)],
+    dataset_version: Annotated[str, Depends(get_dataset_version)],
+    kind: NameKind | None = None,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    # Autocomplete runs per keystroke against in-memory indexes, so it is not metered.
+    media_type = negotiate_media_type(accept)
+    etag = build_etag(
+        dataset_version,
+        "suggest",
+        {"q": q, "kind": kind, "limit": limit},
+        media_type=media_type,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    try:
+        suggestions = suggest_names(q, kind=kind, limit=limit)
+    except (FileNotFoundError, ValueError) as exc:
+        raise DataNotFoundError(str(exc)) from exc
+    return render_model(
+        SuggestResponse(query=q, suggestions=suggestions),
+        media_type=media_type,
+        headers=cache_headers(etag),
+    )
+
+
+@app.get("/scheduler/stats")
+def scheduler_stats(
+    _: Annotated[str, Depends(require_api_key)],
+    scheduler: Annotated[ForecastScheduler, Depends(get_forecast_scheduler)],
+) -> dict:
+    return scheduler.stats()
+
+
+@app.get("/forecast/breakers")
+def forecast_breakers(_: Annotated[str, Depends(require_api_key)]) -> dict:
+    return fit_breakers.stats()
+
+
+@app.get("/cache/warming")
+def cache_warming_stats(_: Annotated[str, Depends(require_api_key)]) -> dict:
+    return cache_warmer.stats()
+
+
+@app.websocket("/ws/prices")
+async def price_updates(websocket: WebSocket, api_key: str | None = None) -> None:
+    # Browsers cannot set headers on WebSockets, so the key may also come as `?api_key=`.
+    try:
+        require_api_key(websocket.headers.get(settings.api_key_header) or api_key)
+    except AuthenticationError:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    queue = price_update_hub.connect()
+
+    async def pump() -> None:
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(pump())
+    sender.add_done_callback(log_task_failure)
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except json.JSONDecodeError:
+                price_update_hub.send_error(queue, "Messages must be JSON.")
+                continue
+            await price_update_hub.handle(queue, message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        price_update_hub.disconnect(queue)
+        sender.cancel()
+
+
+@app.get("/ws/prices/stats")
+def price_update_stats(_: Annotated[str, Depends(require_api_key)]) -> dict:
+    return price_update_hub.stats()
+
+
+@app.get("/diagnostics/memory")
+def diagnostics_memory(
+    _: Annotated[str, Depends(require_api_key)],
+    objects: bool = False,
+) -> dict:
+    # `objects=true` walks the GC heap to count live pandas frames; slow on large heaps.
+    return memory_report(objects=objects)
+
+
+@app.post("/diagnostics/allocations")
+def diagnostics_allocation_snapshot(
+    _: Annotated[str, Depends(require_api_key)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 20,
+    compare_to: int | None = None,
+    frames: Annotated[int, Query(ge=1, le=50)] = 1,
 ) -> dict:
-    return mandi_service.select_best(
-        state=state,
-        commodity=commodity,
-        days=days,
-        limit=limit,
+    # The first snapshot starts tracemalloc (`frames` deep); later ones can diff against it.
+    # With more than one frame, sites are grouped by call stack and each carries its `stack`.
+    try:
+        return allocation_tracer.snapshot(limit=limit, compare_to=compare_to, frames=frames)
+    except ValueError as exc:
+        raise DataNotFoundError(str(exc)) from exc
+
+
+@app.delete("/diagnostics/allocations", status_code=204)
+def diagnostics_stop_tracing(_: Annotated[str, Depends(require_api_key)]) -> Response:
+    allocation_tracer.stop()
+    return Response(status_code=204)
+
+
+def _timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _job_status(record: JobRecord) -> JobStatus:
+    return JobStatus(
+        job_id=record["job_id"],
+        kind=record["kind"],
+        status=record["status"],
+        progress=JobProgress(done=record["progress_done"], total=record["progress_total"]),
+        created_at=_timestamp(record["created_at"]),
+        updated_at=_timestamp(record["updated_at"]),
+        expires_at=_timestamp(record["expires_at"]),
+        error=record["error"],
+    )
+
+
+def _get_job(job_manager: JobManager, job_id: str) -> JobRecord:
+    record = job_manager.get(job_id)
+    if record is None:
+        raise DataNotFoundError(f"Job '{job_id}' not found or expired.")
+    return record
+
+
+@app.post("/jobs/forecast", response_model=JobStatus, status_code=202)
+def submit_forecast_job(
+    payload: ForecastRequest,
+    client_id: Annotated[str, Depends(require_api_key)],
+    run_forecast_pipeline: Annotated[ForecastService, Depends(get_forecast_service)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    job_manager: Annotated[JobManager, Depends(get_job_manager)],
+) -> JobStatus:
+    admission.admit(client_id, estimate_forecast_cost(payload.crop, payload.mandi))
+
+    def run(report: ProgressCallback) -> dict:
+        report(0, 1)
+        # Jobs are already asynchronous, so they wait for a slot and the fit instead of failing.
+        with admission.forecast_slot(wait=True):
+            result = run_forecast_pipeline(payload, bounded=False)
+        report(1, 1)
+        return dict(result)
+
+    record = job_manager.submit("forecast", payload.model_dump(mode="json"), run)
+    return _job_status(record)
+
+
+@app.post("/jobs/best-mandi", response_model=JobStatus, status_code=202)
+def submit_best_mandi_job(
+    payload: BestMandiRequest,
+    client_id: Annotated[str, Depends(require_api_key)],
+    mandi_service: Annotated[MandiComparisonService, Depends(get_mandi_comparison_service)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    job_manager: Annotated[JobManager, Depends(get_job_manager)],
+) -> JobStatus:
+    admission.admit(client_id, estimate_best_mandi_cost(payload.state, payload.commodity))
+
+    def run(report: ProgressCallback) -> dict:
+        with admission.forecast_slot(wait=True):
+            return mandi_service.select_best(
+                state=payload.state,
+                commodity=payload.commodity,
+                days=payload.days,
+                limit=payload.limit,
+                on_progress=report,
+            )
+
+    record = job_manager.submit("best-mandi", payload.model_dump(mode="json"), run)
+    return _job_status(record)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+def job_status(
+    job_id: str,
+    _: Annotated[str, Depends(require_api_key)],
+    job_manager: Annotated[JobManager, Depends(get_job_manager)],
+) -> JobStatus:
+    return _job_status(_get_job(job_manager, job_id))
+
+
+@app.get(
+    "/jobs/{job_id}/result",
+    response_model=ForecastResponse | BestMandiResponse,
+    responses=BINARY_RESPONSE_DOCS,
+)
+def job_result(
+    job_id: str,
+    _: Annotated[str, Depends(require_api_key)],
+    job_manager: Annotated[JobManager, Depends(get_job_manager)],
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    record = _get_job(job_manager, job_id)
+    if record["status"] == "failed":
+        if record["error_kind"] == "not_found":
+            raise DataNotFoundError(record["error"] or "Job data not found.")
+        if record["error_kind"] == "ambiguous":
+            raise AmbiguousNameError(record["error"] or "Job names are ambiguous.", candidates=[])
+        if record["error_kind"] == "forecast":
+            raise ForecastError(record["error"] or "Job forecast failed.")
+        raise RuntimeError(record["error"] or "Job failed.")
+    if record["status"] != "succeeded" or record["result"] is None:
+        raise JobNotReadyError(f"Job '{job_id}' is {record['status']}; poll /jobs/{job_id}.")
+
+    response_schema = ForecastResponse if record["kind"] == "forecast" else BestMandiResponse
+    return render_model(
+        response_schema.model_validate(record["result"]),
+        media_type=negotiate_media_type(accept),
     )
@@ -1,8 +1,10 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class ForecastRequest(BaseModel):
     crop: str = Field(..., examples=["Wheat"])
@@ -36,6 +38,11 @@ class MandiOption(BaseModel):
     expected_7d_change_pct: float
 
 
+class ForecastModelInfo(BaseModel):
+    name: str
+    reason: str
+
+
 class ForecastResponse(BaseModel):
     crop: str
     mandi: str
@@ -49,3 +56,129 @@ class ForecastResponse(BaseModel):
     nearby_mandis: list[MandiOption]
     insights: list[str]
     language: Literal["en", "hi"]
+    forecast_model: ForecastModelInfo | None = None
+    degraded: bool = False
+
+
+class BatchForecastRequest(BaseModel):
+    items: list[ForecastRequest] = Field(..., min_length=1, max_length=50)
+
+
+class BatchForecastItem(BaseModel):
+    crop: str
+    mandi: str
+    status: int
+    data: ForecastResponse | None = None
+    detail: str | None = None
+
+
+class BatchForecastResponse(BaseModel):
+    results: list[BatchForecastItem]
+
+
+class BestMandiOption(BaseModel):
+    mandi: str
+    expected_change_percent: float
+
+
+class BestMandiResponse(BaseModel):
+    state: str
+    commodity: str
+    best_mandis: list[BestMandiOption]
+    failed_markets: int = 0
+
+
+class BestMandiRequest(BaseModel):
+    state: str = Field(..., examples=["Punjab"])
+    commodity: str = Field(..., examples=["Wheat"])
+    days: int = Field(default=7, ge=1, le=7)
+    limit: int = Field(default=3, ge=1)
+
+
+class JobProgress(BaseModel):
+    done: int
+    total: int
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: Literal["forecast", "best-mandi"]
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: JobProgress
+    created_at: datetime
+    updated_at: datetime
+    expires_at: datetime
+    error: str | None = None
+
+
+class PriceIndexPoint(BaseModel):
+    date: date
+    median: float
+    mean: float
+    minimum: float
+    maximum: float
+    count: int
+
+
+class PriceIndexResponse(BaseModel):
+    commodity: str
+    state: str | None = None
+    points: list[PriceIndexPoint]
+
+
+class HistoryPoint(BaseModel):
+    date: date
+    price: float
+
+
+class HistoryBucket(BaseModel):
+    start: date
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
+
+
+class HistoryResponse(BaseModel):
+    crop: str
+    mandi: str
+    state: str | None = None
+    downsample: Literal["none", "lttb", "week", "month"]
+    source_points: int
+    points: list[HistoryPoint] = Field(default_factory=list)
+    buckets: list[HistoryBucket] = Field(default_factory=list)
+
+
+class NameSuggestionItem(BaseModel):
+    name: str
+    kind: Literal["commodity", "state", "market"]
+    score: int
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: list[NameSuggestionItem]
+
+
+class PricePair(BaseModel):
+    crop: str = Field(..., examples=["Onion"])
+    mandi: str = Field(..., examples=["Delhi Azadpur"])
+
+
+class PriceSubscription(BaseModel):
+    action: Literal["subscribe", "unsubscribe"]
+    pairs: list[PricePair] = Field(..., min_length=1, max_length=settings.push_max_pairs)
+
+
+class PriceUpdate(BaseModel):
+    type: Literal["update", "error"]
+    crop: str
+    mandi: str
+    dataset_version: str | None = None
+    current_price: float | None = None
+    shock_alert: str | None = None
+    forecast: list[ForecastPoint] = Field(default_factory=list)
+    forecast_model: ForecastModelInfo | None = None
+    degraded: bool = False
+    detail: str | None = None
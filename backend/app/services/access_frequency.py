@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Hashable
+
+import numpy as np
+
+
+class FrequencySketch:
+    # Count-Min sketch of request counts plus a bounded table of the heaviest keys. Memory is
+    # fixed by (depth, width, capacity); counters halve every `decay_every` records so the
+    # ranking follows recent traffic rather than all-time totals.
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 4,
+        capacity: int = 256,
+        decay_every: int = 100_000,
+    ) -> None:
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.decay_every = decay_every
+        self.recorded = 0
+        self._counts = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+        self._heavy: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def _columns(self, key: Hashable) -> np.ndarray:
+        return np.array([hash((row, key)) % self.width for row in range(self.depth)])
+
+    def record(self, key: Hashable, count: int = 1) -> int:
+        columns = self._columns(key)
+        with self._lock:
+            self._counts[self._rows, columns] += count
+            estimate = int(self._counts[self._rows, columns].min())
+
+            if key in self._heavy or len(self._heavy) < self.capacity:
+                self._heavy[key] = estimate
+            else:
+                coldest = min(self._heavy, key=self._heavy.__getitem__)
+                if estimate > self._heavy[coldest]:
+                    del self._heavy[coldest]
+                    self._heavy[key] = estimate
+
+            self.recorded += count
+            if self.recorded % self.decay_every < count:
+                self._counts >>= 1
+                self._heavy = {
+                    heavy_key: value >> 1
+                    for heavy_key, value in self._heavy.items()
+                    if value >> 1
+                }
+            return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        columns = self._columns(key)
+        with self._lock:
+            return int(self._counts[self._rows, columns].min())
+
+    def top(self, limit: int) -> list[tuple[Hashable, int]]:
+        with self._lock:
+            ranked = sorted(self._heavy.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "width": self.width,
+                "depth": self.depth,
+                "capacity": self.capacity,
+                "tracked": len(self._heavy),
+                "recorded": self.recorded,
+                "sketch_bytes": int(self._counts.nbytes),
+            }
+
+
+# Keyed by (state, market, commodity) as the forecast pipeline resolves them.
+series_frequency = FrequencySketch()
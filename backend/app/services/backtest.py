@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import os
+import statistics
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, TypedDict
+
+from app.services.crop_prices import get_price_store, load_prophet_history
+from app.services.light_models import FORECAST_HORIZON_DAYS
+from app.services.model_registry import MODEL_REGISTRY, get_forecast_model
+
+DEFAULT_MODELS = ("prophet", "prophet_fast", "holt", "seasonal_naive", "naive")
+RESULT_FIELDS = (
+    "commodity",
+    "state",
+    "market",
+    "model",
+    "folds",
+    "points",
+    "mape",
+    "mae",
+    "coverage",
+    "fit_seconds",
+    "peak_memory_mb",
+    "error",
+)
+
+
+class BacktestRow(TypedDict):
+    commodity: str
+    state: str
+    market: str
+    model: str
+    folds: int
+    points: int
+    mape: float | None
+    mae: float | None
+    coverage: float | None
+    fit_seconds: float | None
+    peak_memory_mb: float | None
+    error: str | None
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _origins(history_length: int, folds: int, step: int, min_train: int) -> list[int]:
+    origins = [history_length - step * offset for offset in range(folds, 0, -1)]
+    return [origin for origin in origins if origin >= min_train]
+
+
+def _score_fold(
+    forecast: list[dict[str, Any]],
+    actuals: dict[date, float],
+) -> tuple[list[float], list[float], list[bool]]:
+    abs_errors: list[float] = []
+    pct_errors: list[float] = []
+    covered: list[bool] = []
+    for point in forecast:
+        actual = actuals.get(point["ds"])
+        if actual is None:
+            continue
+        error = abs(point["yhat"] - actual)
+        abs_errors.append(error)
+        if actual != 0:
+            pct_errors.append(error / abs(actual) * 100)
+        covered.append(point["yhat_lower"] <= actual <= point["yhat_upper"])
+    return abs_errors, pct_errors, covered
+
+
+def _evaluate_model(
+    history: list[dict[str, Any]],
+    model_name: str,
+    origins: list[int],
+) -> dict[str, Any]:
+    model = get_forecast_model(model_name)
+    abs_errors: list[float] = []
+    pct_errors: list[float] = []
+    covered: list[bool] = []
+    fit_times: list[float] = []
+    peak_bytes = 0
+    folds = 0
+
+    for index, origin in enumerate(origins):
+        train = history[:origin]
+        cutoff = _as_date(train[-1]["ds"])
+        actuals = {
+            _as_date(row["ds"]): float(row["y"])
+            for row in history[origin:]
+            if (_as_date(row["ds"]) - cutoff).days <= FORECAST_HORIZON_DAYS
+        }
+
+        # Trace allocations on the first fold only; tracemalloc skews the timings.
+        traced = index == 0
+        if traced:
+            tracemalloc.start()
+        started = perf_counter()
+        try:
+            forecast = model(train, FORECAST_HORIZON_DAYS)
+        finally:
+            elapsed = perf_counter() - started
+            if traced:
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        if not traced or len(origins) == 1:
+            fit_times.append(elapsed)
+        fold_abs, fold_pct, fold_covered = _score_fold(forecast, actuals)
+        abs_errors.extend(fold_abs)
+        pct_errors.extend(fold_pct)
+        covered.extend(fold_covered)
+        folds += 1
+
+    return {
+        "folds": folds,
+        "points": len(abs_errors),
+        "mape": statistics.fmean(pct_errors) if pct_errors else None,
+        "mae": statistics.fmean(abs_errors) if abs_errors else None,
+        "coverage": statistics.fmean(covered) if covered else None,
+        "fit_seconds": statistics.fmean(fit_times) if fit_times else None,
+        "peak_memory_mb": peak_bytes / (1024 * 1024),
+    }
+
+
+def evaluate_series(
+    commodity: str,
+    state: str,
+    market: str,
+    models: tuple[str, ...],
+    folds: int,
+    step: int,
+    min_train: int,
+) -> list[BacktestRow]:
+    history = load_prophet_history(state=state, market=market, commodity=commodity)
+    origins = _origins(len(history), folds, step, min_train)
+
+    rows: list[BacktestRow] = []
+    for model_name in models:
+        row: BacktestRow = {
+            "commodity": commodity,
+            "state": state,
+            "market": market,
+            "model": model_name,
+            "folds": 0,
+            "points": 0,
+            "mape": None,
+            "mae": None,
+            "coverage": None,
+            "fit_seconds": None,
+            "peak_memory_mb": None,
+            "error": None,
+        }
+        if not origins:
+            row["error"] = f"History too short for {folds} folds ({len(history)} rows)."
+        else:
+            try:
+                row.update(_evaluate_model(history, model_name, origins))
+            except (RuntimeError, ValueError) as exc:
+                row["error"] = str(exc)
+        rows.append(row)
+    return rows
+
+
+def summarize(rows: list[BacktestRow], mape_target: float) -> list[dict[str, Any]]:
+    grouped: dict[tuple[str, str], list[BacktestRow]] = {}
+    for row in rows:
+        if row["error"] is None and row["mape"] is not None:
+            grouped.setdefault((row["commodity"], row["model"]), []).append(row)
+
+    summary: list[dict[str, Any]] = []
+    for (commodity, model_name), model_rows in sorted(grouped.items()):
+        fit_times = [row["fit_seconds"] for row in model_rows if row["fit_seconds"] is not None]
+        coverages = [row["coverage"] for row in model_rows if row["coverage"] is not None]
+        summary.append(
+            {
+                "commodity": commodity,
+                "model": model_name,
+                "series": len(model_rows),
+                "median_mape": statistics.median(row["mape"] for row in model_rows),
+                "coverage": statistics.fmean(coverages) if coverages else math.nan,
+                "fit_seconds": statistics.fmean(fit_times) if fit_times else math.nan,
+            }
+        )
+
+    cheapest: dict[str, dict[str, Any]] = {}
+    for entry in summary:
+        if entry["median_mape"] > mape_target:
+            continue
+        current = cheapest.get(entry["commodity"])
+        if current is None or entry["fit_seconds"] < current["fit_seconds"]:
+            cheapest[entry["commodity"]] = entry
+    for entry in summary:
+        entry["recommended"] = cheapest.get(entry["commodity"]) is entry
+    return summary
+
+
+def _format_table(summary: list[dict[str, Any]]) -> str:
+    header = (
+        f"{'commodity':<20} {'model':<16} {'series':>6} "
+        f"{'MAPE%':>8} {'cover':>6} {'fit_s':>8}  pick"
+    )
+    lines = [header, "-" * len(header)]
+    for entry in summary:
+        lines.append(
+            f"{entry['commodity'][:20]:<20} {entry['model']:<16} {entry['series']:>6} "
+            f"{entry['median_mape']:>8.2f} {entry['coverage']:>6.2f} {entry['fit_seconds']:>8.3f}"
+            f"  {'*' if entry['recommended'] else ''}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.backtest",
+        description=(
+            "Rolling-origin backtest of the configured forecast models across every "
+            "(commodity, state, market) series. Peak memory covers Python allocations "
+            "only; CmdStan runs in a child process."
+        ),
+    )
+    parser.add_argument(
+        "--models",
+        default=",".join(DEFAULT_MODELS),
+        help=f"Comma-separated model names. Available: {', '.join(sorted(MODEL_REGISTRY))}.",
+    )
+    parser.add_argument("--folds", type=int, default=3, help="Forecast origins per series.")
+    parser.add_argument(
+        "--step", type=int, default=FORECAST_HORIZON_DAYS, help="Rows between origins."
+    )
+    parser.add_argument(
+        "--min-train", type=int, default=30, help="Minimum training rows per fold."
+    )
+    parser.add_argument("--commodity", help="Only backtest this commodity.")
+    parser.add_argument("--state", help="Only backtest this state.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--mape-target", type=float, default=10.0, help="Accuracy target in MAPE %%."
+    )
+    parser.add_argument("--output", help="Write per-series results to this CSV file.")
+    args = parser.parse_args(argv)
+
+    models = tuple(name.strip() for name in args.models.split(",") if name.strip())
+    for name in models:
+        try:
+            get_forecast_model(name)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    series = [
+        (commodity, state, market)
+        for commodity, state, market in get_price_store().series()
+        if (not args.commodity or commodity.casefold() == args.commodity.strip().casefold())
+        and (not args.state or state.casefold() == args.state.strip().casefold())
+    ]
+    if not series:
+        parser.error("No series match the given filters.")
+
+    rows: list[BacktestRow] = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [
+            executor.submit(
+                evaluate_series,
+                commodity,
+                state,
+                market,
+                models,
+                args.folds,
+                args.step,
+                args.min_train,
+            )
+            for commodity, state, market in series
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows.extend(future.result())
+            print(f"\r{done}/{len(futures)} series evaluated", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(
+                sorted(rows, key=lambda row: (row["commodity"], row["state"], row["market"]))
+            )
+
+    print(_format_table(summarize(rows, args.mape_target)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Hashable
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.access_frequency import FrequencySketch, series_frequency
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.crop_prices import get_price_store, load_prophet_history
+from app.services.forecast_cache import ForecastCache, forecast_cache
+from app.services.scheduler import TaskPreemptedError
+from app.services.series_forecast import series_cache_key, submit_series_forecast
+
+MIN_HISTORY_ROWS = 30
+
+
+class CacheWarmer:
+    # Refits the most requested series in the background when their cached forecast is missing
+    # (new dataset version, eviction) or about to expire, so hot series rarely miss the cache.
+    def __init__(
+        self,
+        frequency: FrequencySketch,
+        cache: ForecastCache,
+        top_n: int,
+        interval_seconds: float,
+        lead_seconds: float,
+    ) -> None:
+        self.frequency = frequency
+        self.cache = cache
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.lead_seconds = lead_seconds
+        self.runs = 0
+        self.refreshed = 0
+        self._failed: set[Hashable] = set()
+        self._version: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.top_n <= 0 or settings.serving_mode == "slim":
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="forecast-cache-warmer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.warm_once()
+            except Exception:
+                logger.exception("Cache warming pass failed")
+
+    def warm_once(self) -> int:
+        version = get_price_store().version
+        if version != self._version:
+            # Series that failed against the previous dataset may fit against the new one.
+            self._failed.clear()
+            self._version = version
+
+        pending: list[tuple[Hashable, Future]] = []
+        for (state, market, commodity), _ in self.frequency.top(self.top_n):
+            key = series_cache_key(state, market, commodity)
+            remaining = self.cache.ttl_remaining(key)
+            if key in self._failed or (remaining is not None and remaining > self.lead_seconds):
+                continue
+            try:
+                history = load_prophet_history(state=state, market=market, commodity=commodity)
+            except (FileNotFoundError, RuntimeError, ValueError):
+                self._failed.add(key)
+                continue
+            if len(history) < MIN_HISTORY_ROWS:
+                self._failed.add(key)
+                continue
+            pending.append(
+                (
+                    key,
+                    submit_series_forecast(
+                        state=state,
+                        market=market,
+                        commodity=commodity,
+                        history=history,
+                        priority="background",
+                        refresh=True,
+                    ),
+                )
+            )
+
+        refreshed = 0
+        for key, future in pending:
+            try:
+                future.result()
+            except (CircuitOpenError, TaskPreemptedError):
+                # Shed under load or skipped while the model is unhealthy; the next pass retries.
+                continue
+            except (RuntimeError, ValueError):
+                self._failed.add(key)
+                continue
+            refreshed += 1
+
+        self.runs += 1
+        self.refreshed += refreshed
+        if refreshed:
+            logger.info("Cache warming | version=%s | refreshed=%s", version, refreshed)
+        return refreshed
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.top_n > 0 and settings.serving_mode != "slim",
+            "running": self._thread is not None and self._thread.is_alive(),
+            "top_n": self.top_n,
+            "interval_seconds": self.interval_seconds,
+            "lead_seconds": self.lead_seconds,
+            "runs": self.runs,
+            "refreshed": self.refreshed,
+            "failed": len(self._failed),
+            "hot_series": [
+                {"state": state, "market": market, "commodity": commodity, "requests": count}
+                for (state, market, commodity), count in self.frequency.top(self.top_n)
+            ],
+            "frequency": self.frequency.stats(),
+        }
+
+
+cache_warmer = CacheWarmer(
+    frequency=series_frequency,
+    cache=forecast_cache,
+    top_n=settings.warm_top_n,
+    interval_seconds=settings.warm_interval_seconds,
+    lead_seconds=settings.warm_lead_seconds,
+)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Literal
+
+from app.core.config import settings
+
+Admission = Literal["closed", "trial"]
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a model is skipped because its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive slow or failed fits. Once `reset_seconds`
+    # have passed, a single trial fit is let through; its outcome closes or reopens the circuit.
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def admit(self) -> Admission | None:
+        # "trial" marks the one fit allowed through while half-open; None means skip the model.
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return "closed"
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return "trial"
+            self.rejected += 1
+            return None
+
+    def release_trial(self) -> None:
+        # For a trial fit that never ran, so the next request can take the trial instead.
+        with self._lock:
+            self._trial = False
+
+    def record(self, healthy: bool) -> None:
+        with self._lock:
+            if healthy:
+                self.failures = 0
+                self._opened_at = None
+                self._trial = False
+                return
+
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class BreakerRegistry:
+    # One breaker per model name, created on first use.
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.failure_threshold, self.reset_seconds)
+                self._breakers[name] = breaker
+            return breaker
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_seconds,
+            "fit_deadline_seconds": settings.fit_deadline_seconds,
+            "models": {name: breaker.stats() for name, breaker in sorted(breakers.items())},
+        }
+
+
+fit_breakers = BreakerRegistry(
+    failure_threshold=settings.breaker_failures,
+    reset_seconds=settings.breaker_reset_seconds,
+)
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime
+import hashlib
+import threading
+from datetime import date, datetime
 from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.exceptions import AmbiguousNameError, UnknownNameError
+from app.services.dataset_store import (
+    PriceStore,
+    build_price_store,
+    open_price_store,
+    read_current_version,
+)
+from app.services.name_index import NAME_KINDS, NameKind, NameSuggestion
+from app.services.price_cube import CUBE_STATISTICS
+from app.services.series_features import features_to_dict
+from app.services.sql_store import open_sql_store, read_sql_version
 
 
 DATASET_CANDIDATES = (
@@ -15,6 +32,9 @@ DATASET_CANDIDATES = (
     Path(__file__).resolve().parents[2] / "DATASET" / "Agriculture_price_dataset.csv",
 )
 
+_ATTACH_LOCK = threading.Lock()
+_ATTACHED_STORE: PriceStore | None = None
+
 COLUMN_RENAMES = {
     "Price Date": "Date",
     "Modal_Price": "Modal Price",
@@ -37,6 +57,34 @@ def _resolve_dataset_path() -> Path:
     )
 
 
+def _csv_version(dataset_path: Path) -> str:
+    stat = dataset_path.stat()
+    fingerprint = f"{dataset_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_version() -> str:
+    if settings.storage_backend == "sqlite":
+        path = Path(settings.sqlite_path)
+        version = read_sql_version(path)
+        if not version:
+            raise FileNotFoundError(
+                f"No price database at {path}. Load one with "
+                "'python -m app.services.sql_store append'."
+            )
+        return version
+    if settings.dataset_store_dir:
+        root = Path(settings.dataset_store_dir)
+        version = read_current_version(root)
+        if not version:
+            raise FileNotFoundError(
+                f"No dataset store found at {root}. Build one with "
+                "'python -m app.services.dataset_store build'."
+            )
+        return version
+    return _csv_version(_resolve_dataset_path())
+
+
 def _pd():
     try:
         return import_module("pandas")
@@ -46,11 +94,9 @@ def _pd():
         ) from exc
 
 
-@lru_cache(maxsize=1)
-def _load_rows() -> list[dict[str, Any]]:
+def _clean_frame(frame):
     pd = _pd()
-    dataset_path = _resolve_dataset_path()
-    frame = pd.read_csv(dataset_path).rename(columns=COLUMN_RENAMES)
+    frame = frame.rename(columns=COLUMN_RENAMES)
 
     required_columns = {"Date", "Modal Price", "State", "Market", "Commodity"}
     missing_columns = sorted(required_columns - set(frame.columns))
@@ -66,36 +112,167 @@ def _load_rows() -> list[dict[str, Any]]:
         frame[column] = frame[column].astype(str).str.strip()
 
     frame = frame.dropna(subset=["Date", "Modal Price"])
-    frame = frame[
+    return frame[
         (frame["State"] != "")
         & (frame["Market"] != "")
         & (frame["Commodity"] != "")
     ]
 
+
+@lru_cache(maxsize=1)
+def _load_csv_store(dataset_path: str, version: str) -> PriceStore:
+    # CHANGED: Keyed on the dataset version so an edited CSV is reloaded on next access.
+    pd = _pd()
+    frame = _clean_frame(pd.read_csv(dataset_path))
+
     if len(frame) < 30:
         raise ValueError(
             f"Dataset must contain at least 30 valid rows after cleaning; found {len(frame)}."
         )
 
-    return frame.to_dict(orient="records")
+    store = build_price_store(
+        version=version,
+        dates=frame["Date"].to_numpy(),
+        prices=frame["Modal Price"].to_numpy(),
+        states=frame["State"].to_numpy(),
+        markets=frame["Market"].to_numpy(),
+        commodities=frame["Commodity"].to_numpy(),
+    )
+    store.warm()
+    return store
+
+
+def load_store_from_csv() -> PriceStore:
+    dataset_path = _resolve_dataset_path()
+    return _load_csv_store(str(dataset_path), _csv_version(dataset_path))
+
+
+def _attach(version: str | None, open_store: Callable[[], PriceStore]) -> PriceStore:
+    # Workers share one opened store and switch over when the published version moves.
+    global _ATTACHED_STORE
+
+    store = _ATTACHED_STORE
+    if store is not None and store.version == version:
+        return store
+
+    with _ATTACH_LOCK:
+        store = _ATTACHED_STORE
+        if store is None or store.version != version:
+            store = open_store()
+            store.warm()
+            _ATTACHED_STORE = store
+    return store
+
+
+def _open_file_store(root: Path, version: str | None) -> PriceStore:
+    return open_price_store(
+        root,
+        version,
+        partition_budget_bytes=int(settings.partition_memory_mb * 1024 * 1024),
+    )
+
+
+def get_price_store() -> PriceStore:
+    if settings.storage_backend == "sqlite":
+        path = Path(settings.sqlite_path)
+        return _attach(read_sql_version(path), lambda: open_sql_store(path))
+    if settings.dataset_store_dir:
+        root = Path(settings.dataset_store_dir)
+        version = read_current_version(root)
+        return _attach(version, lambda: _open_file_store(root, version))
+    if settings.serving_mode == "slim":
+        # The CSV loader needs pandas, which slim serving must never import.
+        raise RuntimeError(
+            "Slim serving mode requires a prebuilt dataset store; set AGRIPULSE_DATASET_STORE."
+        )
+    return load_store_from_csv()
+
+
+def resolve_name(kind: NameKind, value: str | None) -> str | None:
+    # Canonical dataset label for a user-supplied name. Ambiguous partials and near-misses raise
+    # with their candidates rather than guessing; names like no label pass through unchanged.
+    if not _norm(value):
+        return value
+    index = get_price_store().name_indexes[kind]
+    resolved = index.resolve(value)
+    if resolved is not None:
+        return resolved
+
+    partial = index.partial_matches(value)
+    if partial:
+        raise AmbiguousNameError(
+            f"{kind.capitalize()} '{value}' matches several names: {', '.join(partial[:10])}. "
+            "Use the full name.",
+            candidates=partial[:10],
+        )
+    candidates = [suggestion["name"] for suggestion in index.suggest(value, limit=5)]
+    if candidates:
+        raise UnknownNameError(
+            f"Unknown {kind} '{value}'. Did you mean: {', '.join(candidates)}? "
+            "See /suggest for more.",
+            candidates=candidates,
+        )
+    return value
+
+
+def suggest_names(
+    query: str,
+    kind: NameKind | None = None,
+    limit: int = 10,
+) -> list[NameSuggestion]:
+    indexes = get_price_store().name_indexes
+    suggestions: list[NameSuggestion] = []
+    for name_kind in (kind,) if kind else NAME_KINDS:
+        suggestions.extend(indexes[name_kind].suggest(query, limit))
+    suggestions.sort(key=lambda item: (item["score"], len(item["name"])))
+    return suggestions[:limit]
 
 
 def resolve_state_for_market(market: str) -> str | None:
-    market_norm = _norm(market)
-    if not market_norm:
+    if not _norm(market):
         return None
 
-    states = {
-        str(row.get("State", "")).strip()
-        for row in _load_rows()
-        if _norm(str(row.get("Market", ""))) == market_norm
-    }
-    states.discard("")
+    states = get_price_store().states_for_market(market)
     if len(states) == 1:
         return next(iter(states))
     return None
 
 
+def markets_for_state_and_commodity(state: str, commodity: str) -> list[str]:
+    return get_price_store().markets_for(state, commodity)
+
+
+def find_exact_series(
+    state: str | None,
+    market: str,
+    commodity: str,
+) -> tuple[PriceStore, int | None]:
+    # Mirrors the first (exact market) lookup in `load_prophet_history`.
+    store = get_price_store()
+    if not _norm(market):
+        return store, None
+    index = store.series_index(
+        commodity,
+        state=state if _norm(state) else None,
+        market=market,
+    )
+    return store, index
+
+
+def series_features(
+    state: str | None,
+    market: str,
+    commodity: str,
+) -> dict[str, float] | None:
+    store, index = find_exact_series(state=state, market=market, commodity=commodity)
+    if index is None:
+        return None
+    features = store.series_features[index]
+    if np.isnan(features).any():
+        return None
+    return features_to_dict(features)
+
+
 def load_prophet_history(
     state: str | None,
     market: str,
@@ -103,36 +280,57 @@ def load_prophet_history(
 ) -> list[dict[str, Any]]:
     state_norm = _norm(state)
     market_norm = _norm(market)
-    commodity_norm = _norm(commodity)
-
-    filtered = [
-        row
-        for row in _load_rows()
-        if _norm(str(row.get("Commodity", ""))) == commodity_norm
-        and _norm(str(row.get("Market", ""))) == market_norm
-        and (not state_norm or _norm(str(row.get("State", ""))) == state_norm)
+    store = get_price_store()
+
+    days, prices = store.select(
+        commodity,
+        state=state if state_norm else None,
+        market=market,
+    )
+    if not len(days):
+        # CHANGED: Fall back to the daily median of the state, then the country, instead of
+        # handing the model every overlapping market row.
+        cube = store.price_cube
+        group = cube.group_index(commodity, state) if state_norm and market_norm else None
+        if group is None:
+            group = cube.group_index(commodity)
+        if group is not None:
+            days, statistics = cube.group(group)
+            prices = statistics["median"]
+
+    timestamps = days.astype("datetime64[s]").tolist()
+    return [
+        {"ds": ds_value, "y": price}
+        for ds_value, price in zip(timestamps, prices.tolist())
+        if isinstance(ds_value, datetime)
     ]
-    if not filtered and state_norm and market_norm:
-        filtered = [
-            row
-            for row in _load_rows()
-            if _norm(str(row.get("Commodity", ""))) == commodity_norm
-            and _norm(str(row.get("State", ""))) == state_norm
-        ]
-    if not filtered:
-        filtered = [
-            row
-            for row in _load_rows()
-            if _norm(str(row.get("Commodity", ""))) == commodity_norm
-        ]
-
-    filtered.sort(key=lambda row: row["Date"])
-    formatted: list[dict[str, Any]] = []
-    for row in filtered:
-        ds_value = row["Date"]
-        if hasattr(ds_value, "to_pydatetime"):
-            ds_value = ds_value.to_pydatetime()
-        if isinstance(ds_value, datetime):
-            formatted.append({"ds": ds_value, "y": float(row["Modal Price"])})
-
-    return formatted
+
+
+def regional_price_index(
+    commodity: str,
+    state: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict[str, Any]:
+    cube = get_price_store().price_cube
+    commodity = resolve_name("commodity", commodity)
+    state = resolve_name("state", state)
+    group = cube.group_index(commodity, state if _norm(state) else None)
+    if group is None:
+        scope = f"state='{state}'" if _norm(state) else "the national index"
+        raise ValueError(f"No price index for commodity='{commodity}' in {scope}.")
+
+    days, statistics = cube.group(group)
+    lower = np.searchsorted(days, np.datetime64(start, "D")) if start else 0
+    upper = np.searchsorted(days, np.datetime64(end, "D"), side="right") if end else len(days)
+    columns = [statistics[name][lower:upper].tolist() for name in CUBE_STATISTICS]
+
+    commodity_label, state_label = cube.group_labels(group)
+    return {
+        "commodity": commodity_label,
+        "state": state_label,
+        "points": [
+            {"date": day, **dict(zip(CUBE_STATISTICS, values))}
+            for day, *values in zip(days[lower:upper].tolist(), *columns)
+        ],
+    }
@@ -0,0 +1,566 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.services.name_index import NameIndex
+from app.services.price_cube import PriceCube, build_price_cube, load_price_cube, save_price_cube
+from app.services.series_features import FEATURE_NAMES, compute_series_features
+
+STORE_FORMAT = 2
+CURRENT_POINTER = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+LABELS_FILE = "labels.json"
+ARRAY_FIELDS = (
+    "days",
+    "prices",
+    "row_ids",
+    "series_keys",
+    "series_bounds",
+    "series_features",
+)
+LABEL_FIELDS = ("commodities", "states", "markets")
+PARTITIONED_ARRAY_FIELDS = (
+    "series_keys",
+    "series_bounds",
+    "series_features",
+    "series_partitions",
+)
+PARTITION_ARRAY_FIELDS = ("days", "prices", "row_ids")
+PARTITIONS_DIR = "partitions"
+CUBE_DIR = "cube"
+KEY_COLUMNS = {"commodity": 0, "state": 1, "market": 2}
+KIND_LABELS = {"commodity": "commodities", "state": "states", "market": "markets"}
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().casefold()
+
+
+@dataclass(frozen=True)
+class PriceStore:
+    # Rows are sorted by (commodity, state, market, date, source row) so every
+    # series is one contiguous slice; arrays may be read-only memory maps.
+    version: str
+    days: np.ndarray
+    prices: np.ndarray
+    row_ids: np.ndarray
+    series_keys: np.ndarray
+    series_bounds: np.ndarray
+    series_features: np.ndarray
+    commodities: tuple[str, ...]
+    states: tuple[str, ...]
+    markets: tuple[str, ...]
+
+    @property
+    def row_count(self) -> int:
+        return int(self.prices.shape[0])
+
+    @property
+    def series_count(self) -> int:
+        return int(self.series_keys.shape[0])
+
+    @cached_property
+    def _label_codes(self) -> dict[str, dict[str, np.ndarray]]:
+        lookups: dict[str, dict[str, np.ndarray]] = {}
+        for kind, labels in (
+            ("commodity", self.commodities),
+            ("state", self.states),
+            ("market", self.markets),
+        ):
+            grouped: dict[str, list[int]] = {}
+            for code, label in enumerate(labels):
+                grouped.setdefault(_norm(label), []).append(code)
+            lookups[kind] = {
+                key: np.asarray(codes, dtype=np.int32) for key, codes in grouped.items()
+            }
+        return lookups
+
+    @cached_property
+    def price_cube(self) -> PriceCube:
+        return build_price_cube(self)
+
+    @cached_property
+    def name_indexes(self) -> dict[str, NameIndex]:
+        return {
+            "commodity": NameIndex("commodity", self.commodities),
+            "state": NameIndex("state", self.states),
+            "market": NameIndex("market", self.markets),
+        }
+
+    def warm(self) -> None:
+        # Builds the price cube and name indexes at load time, not on the first request.
+        self.price_cube
+        self.name_indexes
+
+    def _codes(self, kind: str, value: str) -> np.ndarray:
+        return self._label_codes[kind].get(_norm(value), np.empty(0, dtype=np.int32))
+
+    def _series_mask(
+        self,
+        commodity: str | None = None,
+        state: str | None = None,
+        market: str | None = None,
+    ) -> np.ndarray:
+        mask = np.ones(self.series_count, dtype=bool)
+        for kind, value in (("commodity", commodity), ("state", state), ("market", market)):
+            if value is None:
+                continue
+            column = self.series_keys[:, KEY_COLUMNS[kind]]
+            mask &= np.isin(column, self._codes(kind, value))
+        return mask
+
+    def _series_rows(self, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start, stop = self.series_bounds[index].tolist()
+        return self.days[start:stop], self.prices[start:stop], self.row_ids[start:stop]
+
+    def states_for_market(self, market: str, commodity: str | None = None) -> set[str]:
+        mask = self._series_mask(commodity=commodity, market=market)
+        return {self.states[code] for code in np.unique(self.series_keys[mask, 1])}
+
+    def markets_for(self, state: str, commodity: str) -> list[str]:
+        mask = self._series_mask(commodity=commodity, state=state)
+        return sorted({self.markets[code] for code in np.unique(self.series_keys[mask, 2])})
+
+    def select(
+        self,
+        commodity: str,
+        state: str | None = None,
+        market: str | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # `None` matches any value; the result is ordered by date, then source row.
+        matches = np.flatnonzero(
+            self._series_mask(commodity=commodity, state=state, market=market)
+        ).tolist()
+        if len(matches) == 1:
+            days, prices, _ = self._series_rows(matches[0])
+            return days, prices
+        if not matches:
+            return self.days[:0], self.prices[:0]
+
+        parts = [self._series_rows(index) for index in matches]
+        days = np.concatenate([part[0] for part in parts])
+        prices = np.concatenate([part[1] for part in parts])
+        row_ids = np.concatenate([part[2] for part in parts])
+        order = np.lexsort((row_ids, days))
+        return days[order], prices[order]
+
+    def series_index(
+        self,
+        commodity: str,
+        state: str | None = None,
+        market: str | None = None,
+    ) -> int | None:
+        mask = self._series_mask(commodity=commodity, state=state, market=market)
+        matches = np.flatnonzero(mask)
+        if len(matches) != 1:
+            return None
+        return int(matches[0])
+
+    def series(self) -> list[tuple[str, str, str]]:
+        return [
+            (self.commodities[c], self.states[s], self.markets[m])
+            for c, s, m in self.series_keys.tolist()
+        ]
+
+
+class PartitionCache:
+    # Partitions are read fully into memory on first use and evicted least recently used
+    # first once resident bytes exceed the budget; the newest partition always stays.
+    def __init__(
+        self,
+        directory: Path,
+        partitions: list[dict[str, Any]],
+        budget_bytes: int,
+    ) -> None:
+        self.directory = directory
+        self.partitions = partitions
+        self.budget_bytes = budget_bytes
+        self.loads = 0
+        self.evictions = 0
+        self._loaded: OrderedDict[int, dict[str, np.ndarray]] = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, partition_id: int) -> dict[str, np.ndarray]:
+        with self._lock:
+            arrays = self._loaded.get(partition_id)
+            if arrays is not None:
+                self._loaded.move_to_end(partition_id)
+                return arrays
+
+        path = self.directory / PARTITIONS_DIR / self.partitions[partition_id]["dir"]
+        arrays = {name: np.load(path / f"{name}.npy") for name in PARTITION_ARRAY_FIELDS}
+
+        with self._lock:
+            if partition_id in self._loaded:
+                return self._loaded[partition_id]
+            self._loaded[partition_id] = arrays
+            self._resident_bytes += sum(array.nbytes for array in arrays.values())
+            self.loads += 1
+            while self._resident_bytes > self.budget_bytes and len(self._loaded) > 1:
+                _, evicted = self._loaded.popitem(last=False)
+                self._resident_bytes -= sum(array.nbytes for array in evicted.values())
+                self.evictions += 1
+        return arrays
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "partitions": len(self.partitions),
+                "loaded": [self.partitions[index]["key"] for index in self._loaded],
+                "resident_bytes": self._resident_bytes,
+                "budget_bytes": self.budget_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+
+@dataclass(frozen=True)
+class MappedPriceStore(PriceStore):
+    # A flat store opened from disk; its price cube is published beside the arrays, so every
+    # worker maps one copy instead of rebuilding it.
+    directory: Path
+
+    @cached_property
+    def price_cube(self) -> PriceCube:
+        cube_dir = self.directory / CUBE_DIR
+        if not cube_dir.exists():
+            # Stores published before the cube was saved with them.
+            return build_price_cube(self)
+        return load_price_cube(cube_dir)
+
+
+@dataclass(frozen=True)
+class PartitionedPriceStore(PriceStore):
+    # Series metadata, labels and the price cube are global and small; `series_bounds`
+    # index into the series' own partition, whose rows load lazily.
+    series_partitions: np.ndarray
+    partition_cache: PartitionCache
+    total_rows: int
+
+    @property
+    def row_count(self) -> int:
+        return self.total_rows
+
+    @cached_property
+    def price_cube(self) -> PriceCube:
+        return load_price_cube(self.partition_cache.directory / CUBE_DIR)
+
+    def _series_rows(self, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        arrays = self.partition_cache.get(int(self.series_partitions[index]))
+        start, stop = self.series_bounds[index].tolist()
+        return (
+            arrays["days"][start:stop],
+            arrays["prices"][start:stop],
+            arrays["row_ids"][start:stop],
+        )
+
+
+def build_price_store(
+    version: str,
+    dates: np.ndarray,
+    prices: np.ndarray,
+    states: np.ndarray,
+    markets: np.ndarray,
+    commodities: np.ndarray,
+) -> PriceStore:
+    days = np.asarray(dates).astype("datetime64[D]")
+    values = np.asarray(prices, dtype=np.float64)
+    row_ids = np.arange(values.shape[0], dtype=np.int64)
+
+    commodity_labels, commodity_codes = np.unique(
+        np.asarray(commodities, dtype=str), return_inverse=True
+    )
+    state_labels, state_codes = np.unique(np.asarray(states, dtype=str), return_inverse=True)
+    market_labels, market_codes = np.unique(np.asarray(markets, dtype=str), return_inverse=True)
+
+    order = np.lexsort((row_ids, days, market_codes, state_codes, commodity_codes))
+    keys = np.column_stack(
+        (commodity_codes[order], state_codes[order], market_codes[order])
+    ).astype(np.int32)
+
+    if len(keys):
+        changed = np.any(keys[1:] != keys[:-1], axis=1)
+        starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+    else:
+        starts = np.empty(0, dtype=np.int64)
+    stops = np.append(starts[1:], len(keys))
+
+    sorted_days = days[order]
+    sorted_values = values[order]
+    features = np.array(
+        [
+            compute_series_features(sorted_days[start:stop], sorted_values[start:stop])
+            for start, stop in zip(starts.tolist(), stops.tolist())
+        ]
+    ).reshape(len(starts), len(FEATURE_NAMES))
+
+    return PriceStore(
+        version=version,
+        days=np.ascontiguousarray(sorted_days),
+        prices=np.ascontiguousarray(sorted_values),
+        row_ids=np.ascontiguousarray(row_ids[order]),
+        series_keys=np.ascontiguousarray(keys[starts]),
+        series_bounds=np.column_stack((starts, stops)).astype(np.int64),
+        series_features=features,
+        commodities=tuple(str(label) for label in commodity_labels),
+        states=tuple(str(label) for label in state_labels),
+        markets=tuple(str(label) for label in market_labels),
+    )
+
+
+def read_current_version(root: Path) -> str | None:
+    # The published directory's name. It doubles as the store version, so caches keyed on the
+    # version move over when the same data is republished with another layout.
+    try:
+        version = (root / CURRENT_POINTER).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def _prune_versions(root: Path, keep: int) -> None:
+    # Dot-prefixed directories are other builds still staging; the current version always stays.
+    current = read_current_version(root)
+    versions = sorted(
+        (
+            path
+            for path in root.iterdir()
+            if not path.name.startswith(".") and (path / MANIFEST_FILE).exists()
+        ),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in versions[keep:]:
+        if stale.name == current:
+            continue
+        try:
+            shutil.rmtree(stale)
+        except OSError:
+            # Still mapped by a worker on platforms that lock open files.
+            continue
+
+
+def _staging_dir(root: Path, version: str) -> Path:
+    # Unique per build, so concurrent builds of one version never write into each other.
+    staging = root / f".{version}.{uuid.uuid4().hex}.tmp"
+    staging.mkdir(parents=True)
+    return staging
+
+
+def save_price_store(store: PriceStore, root: Path, keep: int = 2) -> Path:
+    staging = _staging_dir(root, store.version)
+
+    for name in ARRAY_FIELDS:
+        np.save(staging / f"{name}.npy", np.ascontiguousarray(getattr(store, name)))
+
+    labels = {name: list(getattr(store, name)) for name in LABEL_FIELDS}
+    (staging / LABELS_FILE).write_text(json.dumps(labels), encoding="utf-8")
+    save_price_cube(store.price_cube, staging / CUBE_DIR)
+
+    manifest: dict[str, Any] = {
+        "format": STORE_FORMAT,
+        "version": store.version,
+        "rows": store.row_count,
+        "series": store.series_count,
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return _publish(staging, root, store.version, keep)
+
+
+def _publish(staging: Path, root: Path, version: str, keep: int) -> Path:
+    # Every publish gets its own directory, named in CURRENT, so a republished version (e.g. with
+    # another layout) never rewrites files under workers still attached to the previous one.
+    target = root / f"{version}-{uuid.uuid4().hex[:8]}"
+    staging.rename(target)
+
+    pointer_tmp = root / f".{CURRENT_POINTER}.{uuid.uuid4().hex}.tmp"
+    pointer_tmp.write_text(target.name, encoding="utf-8")
+    os.replace(pointer_tmp, root / CURRENT_POINTER)
+
+    # Old versions are removed only once CURRENT points at the new one.
+    _prune_versions(root, keep=max(1, keep))
+    return target
+
+
+def save_partitioned_store(
+    store: PriceStore,
+    root: Path,
+    partition_by: tuple[str, ...] = ("state",),
+    keep: int = 2,
+) -> Path:
+    staging = _staging_dir(root, store.version)
+    (staging / PARTITIONS_DIR).mkdir()
+
+    columns = [KEY_COLUMNS[name] for name in partition_by]
+    partition_keys, partition_of = np.unique(
+        store.series_keys[:, columns], axis=0, return_inverse=True
+    )
+    partition_of = partition_of.reshape(-1)
+    # Series are regrouped partition by partition; this order defines global series indexes.
+    order = np.argsort(partition_of, kind="stable")
+    local_bounds = np.empty((len(order), 2), dtype=np.int64)
+
+    partitions: list[dict[str, Any]] = []
+    offset = 0
+    for partition_id, key in enumerate(partition_keys.tolist()):
+        members = order[offset : offset + int(np.count_nonzero(partition_of == partition_id))]
+        bounds = store.series_bounds[members]
+        lengths = bounds[:, 1] - bounds[:, 0]
+        stops = np.cumsum(lengths)
+        local_bounds[offset : offset + len(members)] = np.column_stack((stops - lengths, stops))
+        rows = np.concatenate([np.arange(start, stop) for start, stop in bounds.tolist()])
+
+        directory = f"p{partition_id:04d}"
+        (staging / PARTITIONS_DIR / directory).mkdir()
+        size = 0
+        for name in PARTITION_ARRAY_FIELDS:
+            array = np.ascontiguousarray(np.asarray(getattr(store, name))[rows])
+            np.save(staging / PARTITIONS_DIR / directory / f"{name}.npy", array)
+            size += array.nbytes
+
+        key_labels = [
+            getattr(store, KIND_LABELS[name])[code] for name, code in zip(partition_by, key)
+        ]
+        partitions.append(
+            {
+                "key": "/".join(key_labels),
+                "labels": dict(zip(partition_by, key_labels)),
+                "dir": directory,
+                "series": [offset, offset + len(members)],
+                "rows": int(len(rows)),
+                "bytes": size,
+            }
+        )
+        offset += len(members)
+
+    arrays = {
+        "series_keys": store.series_keys[order],
+        "series_bounds": local_bounds,
+        "series_features": store.series_features[order],
+        "series_partitions": partition_of[order].astype(np.int32),
+    }
+    for name in PARTITIONED_ARRAY_FIELDS:
+        np.save(staging / f"{name}.npy", np.ascontiguousarray(arrays[name]))
+    labels = {name: list(getattr(store, name)) for name in LABEL_FIELDS}
+    (staging / LABELS_FILE).write_text(json.dumps(labels), encoding="utf-8")
+    save_price_cube(store.price_cube, staging / CUBE_DIR)
+
+    manifest: dict[str, Any] = {
+        "format": STORE_FORMAT,
+        "layout": "partitioned",
+        "version": store.version,
+        "rows": store.row_count,
+        "series": store.series_count,
+        "partition_by": list(partition_by),
+        "partitions": partitions,
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return _publish(staging, root, store.version, keep)
+
+
+def open_price_store(
+    root: Path,
+    version: str | None = None,
+    partition_budget_bytes: int = 512 * 1024 * 1024,
+) -> PriceStore:
+    version = version or read_current_version(root)
+    if not version:
+        raise FileNotFoundError(
+            f"No dataset store found at {root}. Build one with "
+            "'python -m app.services.dataset_store build'."
+        )
+
+    directory = root / version
+    manifest = json.loads((directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+    if manifest.get("format") != STORE_FORMAT:
+        raise ValueError(
+            f"Unsupported dataset store format {manifest.get('format')!r} at {directory}; "
+            "rebuild it with 'python -m app.services.dataset_store build'."
+        )
+
+    labels = json.loads((directory / LABELS_FILE).read_text(encoding="utf-8"))
+    if manifest.get("layout") == "partitioned":
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in PARTITIONED_ARRAY_FIELDS
+        }
+        return PartitionedPriceStore(
+            version=version,
+            days=np.empty(0, dtype="datetime64[D]"),
+            prices=np.empty(0, dtype=np.float64),
+            row_ids=np.empty(0, dtype=np.int64),
+            **arrays,
+            **{name: tuple(labels[name]) for name in LABEL_FIELDS},
+            partition_cache=PartitionCache(
+                directory, manifest["partitions"], partition_budget_bytes
+            ),
+            total_rows=int(manifest["rows"]),
+        )
+
+    arrays = {
+        name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ARRAY_FIELDS
+    }
+    return MappedPriceStore(
+        version=version,
+        **arrays,
+        **{name: tuple(labels[name]) for name in LABEL_FIELDS},
+        directory=directory,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.core.config import settings
+    from app.services.crop_prices import load_store_from_csv
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.dataset_store",
+        description="Build the shared, memory-mapped price dataset used by API workers.",
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser(
+        "build", help="Clean the CSV dataset and publish a new store version."
+    )
+    build.add_argument("--output", default=settings.dataset_store_dir, help="Store root directory.")
+    build.add_argument("--keep", type=int, default=2, help="Number of store versions to retain.")
+    build.add_argument(
+        "--partition-by",
+        choices=("state", "state,commodity"),
+        help="Write one lazily loaded partition per state (or per state and commodity).",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.output:
+        parser.error("--output is required when AGRIPULSE_DATASET_STORE is not set.")
+
+    store = load_store_from_csv()
+    if args.partition_by:
+        target = save_partitioned_store(
+            store,
+            Path(args.output),
+            partition_by=tuple(args.partition_by.split(",")),
+            keep=args.keep,
+        )
+    else:
+        target = save_price_store(store, Path(args.output), keep=args.keep)
+    print(
+        f"Published dataset store {store.version} "
+        f"({store.row_count} rows, {store.series_count} series) to {target}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import gc
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.memory import deep_sizeof, is_mapped, process_memory
+from app.services.access_frequency import series_frequency
+from app.services.crop_prices import (
+    _load_csv_store,
+    get_price_store,
+    load_store_from_csv,
+)
+from app.services.dataset_store import PartitionedPriceStore, PriceStore
+from app.services.forecast_cache import forecast_cache
+from app.services.forecast_store import _load_forecasts
+
+HEAVY_MODULES = ("pandas", "prophet", "cmdstanpy", "msgpack")
+STORE_ARRAYS = (
+    "days",
+    "prices",
+    "row_ids",
+    "series_keys",
+    "series_bounds",
+    "series_features",
+    "series_partitions",
+)
+# Built lazily on first use; unbuilt indexes are reported as null rather than built here.
+STORE_INDEXES = ("_label_codes", "name_indexes", "price_cube")
+
+
+def _store_report(store: PriceStore) -> dict[str, Any]:
+    arrays = [
+        value
+        for value in (getattr(store, name, None) for name in STORE_ARRAYS)
+        if isinstance(value, np.ndarray)
+    ]
+    report: dict[str, Any] = {
+        "version": store.version,
+        "backend": type(store).__name__,
+        "rows": store.row_count,
+        "series": store.series_count,
+        "array_bytes": sum(array.nbytes for array in arrays if not is_mapped(array)),
+        "mapped_bytes": sum(array.nbytes for array in arrays if is_mapped(array)),
+        "label_bytes": deep_sizeof((store.commodities, store.states, store.markets)),
+        "indexes": {
+            name.lstrip("_"): deep_sizeof(store.__dict__[name]) if name in store.__dict__ else None
+            for name in STORE_INDEXES
+        },
+        "partitions": None,
+    }
+    if isinstance(store, PartitionedPriceStore):
+        report["partitions"] = store.partition_cache.stats()
+    return report
+
+
+def _lru_report(cached: Any, current: Callable[[], Any] | None) -> dict[str, Any]:
+    # lru_cache exposes no handle on its values, so only the current version's entry is sized.
+    info = cached.cache_info()
+    estimated = 0
+    if info.currsize and current is not None:
+        try:
+            estimated = deep_sizeof(current())
+        except (FileNotFoundError, RuntimeError, ValueError):
+            estimated = None
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "estimated_bytes": estimated,
+    }
+
+
+def _live_frames() -> dict[str, int]:
+    # Walks every tracked object, so it is opt-in: pandas frames still referenced after fits.
+    pd = sys.modules.get("pandas")
+    frames = [item for item in gc.get_objects() if pd and isinstance(item, pd.DataFrame)]
+    return {
+        "count": len(frames),
+        "bytes": int(sum(frame.memory_usage(index=True, deep=False).sum() for frame in frames)),
+    }
+
+
+def memory_report(objects: bool = False) -> dict[str, Any]:
+    store: PriceStore | None = None
+    try:
+        store = get_price_store()
+        dataset: dict[str, Any] = _store_report(store)
+    except (FileNotFoundError, RuntimeError, ValueError) as exc:
+        dataset = {"error": str(exc)}
+
+    # Re-requesting the current entry is a cache hit whenever it is already resident.
+    csv_store: Callable[[], Any] | None = None
+    precomputed: Callable[[], Any] | None = None
+    if store is not None and settings.storage_backend == "memory":
+        if settings.dataset_store_dir:
+            root = str(Path(settings.dataset_store_dir))
+            precomputed = partial(_load_forecasts, root, store.version)
+        else:
+            csv_store = load_store_from_csv
+
+    return {
+        "process": process_memory(),
+        "dataset": dataset,
+        "caches": {
+            "forecasts": {
+                **forecast_cache.stats(),
+                "estimated_bytes": forecast_cache.estimated_bytes(),
+            },
+            "csv_store": _lru_report(_load_csv_store, csv_store),
+            "precomputed_forecasts": _lru_report(_load_forecasts, precomputed),
+            "series_frequency": series_frequency.stats(),
+        },
+        "modules": {name: name in sys.modules for name in HEAVY_MODULES},
+        "gc": {"tracked_objects": len(gc.get_objects()) if objects else None},
+        "frames": _live_frames() if objects else None,
+    }
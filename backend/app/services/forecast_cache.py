@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.config import settings
+from app.core.memory import deep_sizeof
+
+
+class ForecastCache:
+    # Bounded LRU with a per-entry TTL; fitted forecasts only change with the dataset.
+    # Values are copied on the way in and out so callers cannot mutate a shared entry.
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _live_entry(self, key: Hashable) -> tuple[float, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def contains(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def ttl_remaining(self, key: Hashable) -> float | None:
+        # Seconds until the entry expires, without counting as a hit or refreshing recency.
+        with self._lock:
+            entry = self._live_entry(key)
+            return None if entry is None else entry[0] - time.monotonic()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def estimated_bytes(self) -> int:
+        with self._lock:
+            return deep_sizeof(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+forecast_cache = ForecastCache(
+    max_entries=settings.forecast_cache_entries,
+    ttl_seconds=settings.forecast_cache_ttl_seconds,
+)
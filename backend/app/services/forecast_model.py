@@ -41,6 +41,7 @@ def _to_finite_float(value: Any) -> float | None:
 def run_prophet_forecast(
     history: list[dict[str, Any]],
     periods: int = 7,
+    options: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
     pd = _pd()
     Prophet = _prophet_cls()
@@ -69,7 +70,7 @@ def run_prophet_forecast(
     _ = periods  # Keep backward compatibility with existing callers.
 
     try:
-        model = Prophet()
+        model = Prophet(**(options or {}))
     except Exception as exc:
         raise RuntimeError(
             "Failed to initialize Prophet backend. Install/fix CmdStan (e.g. "
@@ -2,16 +2,22 @@ from __future__ import annotations
 
 from typing import Literal, TypedDict
 
+from app.core.config import settings
 from app.core.exceptions import DataNotFoundError, ForecastError, RecommendationError
 from app.core.logger import logger
 from app.schemas import ForecastRequest
 from app.services.alerts import detect_price_shock
-from app.services.crop_prices import load_prophet_history, resolve_state_for_market
-from app.services.forecast_model import run_prophet_forecast
+from app.services.crop_prices import (
+    load_prophet_history,
+    resolve_name,
+    resolve_state_for_market,
+)
 from app.services.insights import generate_insights
 from app.services.mandi_lookup import get_nearby_mandis
 from app.services.recommendation import generate_recommendation
 from app.services.risk_analysis import calculate_confidence_and_risk
+from app.services.scheduler import Priority
+from app.services.series_forecast import forecast_series
 from app.services.volatility import classify_volatility
 
 
@@ -28,16 +34,30 @@ class ForecastPipelineResult(TypedDict):
     nearby_mandis: list[dict]
     insights: list[str]
     language: Literal["en", "hi"]
+    forecast_model: dict
+    degraded: bool
 
 
-def run_forecast_pipeline(payload: ForecastRequest) -> ForecastPipelineResult:
+def run_forecast_pipeline(
+    payload: ForecastRequest,
+    priority: Priority = "interactive",
+    deadline: float | None = None,
+    bounded: bool = True,
+) -> ForecastPipelineResult:
     # CHANGED: Centralized orchestration for the full forecast workflow.
+    # Bounded runs wait `deadline` (default: the configured fit deadline, read per call so it
+    # matches the breaker's slow-fit threshold); unbounded runs wait for the fit.
+    if bounded and deadline is None:
+        deadline = settings.fit_deadline_seconds
     try:
-        state = resolve_state_for_market(payload.mandi)
+        # Resolve partial or misspelled names before any history is loaded.
+        crop = resolve_name("commodity", payload.crop)
+        mandi = resolve_name("market", payload.mandi)
+        state = resolve_state_for_market(mandi)
         prophet_history = load_prophet_history(
             state=state,
-            market=payload.mandi,
-            commodity=payload.crop,
+            market=mandi,
+            commodity=crop,
         )
     except FileNotFoundError as exc:
         raise DataNotFoundError(str(exc)) from exc
@@ -46,7 +66,7 @@ def run_forecast_pipeline(payload: ForecastRequest) -> ForecastPipelineResult:
 
     if not prophet_history:
         raise DataNotFoundError(
-            f"No historical data found for commodity='{payload.crop}' and market='{payload.mandi}'."
+            f"No historical data found for commodity='{crop}' and market='{mandi}'."
         )
 
     if len(prophet_history) < 30:
@@ -55,9 +75,30 @@ def run_forecast_pipeline(payload: ForecastRequest) -> ForecastPipelineResult:
         )
 
     try:
-        forecast_points = run_prophet_forecast(history=prophet_history, periods=payload.days)
+        series_forecast = forecast_series(
+            state=state,
+            market=mandi,
+            commodity=crop,
+            history=prophet_history,
+            periods=payload.days,
+            priority=priority,
+            deadline=deadline if bounded else None,
+            fallback=True,
+            bounded=bounded,
+        )
+    except FileNotFoundError as exc:
+        raise DataNotFoundError(str(exc)) from exc
     except (RuntimeError, ValueError) as exc:
         raise ForecastError(str(exc)) from exc
+    forecast_points = series_forecast["forecast"]
+    degraded = series_forecast.get("degraded", False)
+    if degraded:
+        logger.warning(
+            "Degraded forecast | crop=%s | mandi=%s | %s",
+            crop,
+            mandi,
+            series_forecast["model"]["reason"],
+        )
 
     try:
         recommendation = generate_recommendation(forecast_points)
@@ -82,16 +123,17 @@ def run_forecast_pipeline(payload: ForecastRequest) -> ForecastPipelineResult:
 
     risk_level = str(recommendation.get("risk_level", "UNKNOWN")).upper()
     logger.info(
-        "Forecast completed | crop=%s | mandi=%s | change=%+.2f%% | risk=%s",
-        payload.crop,
-        payload.mandi,
+        "Forecast completed | crop=%s | mandi=%s | change=%+.2f%% | risk=%s | model=%s",
+        crop,
+        mandi,
         expected_change_pct,
         risk_level,
+        series_forecast["model"]["name"],
     )
 
     return {
-        "crop": payload.crop,
-        "mandi": payload.mandi,
+        "crop": crop,
+        "mandi": mandi,
         "current_price": current_price,
         "trend_direction": (
             "up"
@@ -108,4 +150,6 @@ def run_forecast_pipeline(payload: ForecastRequest) -> ForecastPipelineResult:
         "nearby_mandis": nearby,
         "insights": insights,
         "language": payload.language,
+        "forecast_model": series_forecast["model"],
+        "degraded": degraded,
     }
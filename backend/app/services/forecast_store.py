@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.services.crop_prices import find_exact_series, get_price_store, load_prophet_history
+
+FORECASTS_FILE = "forecasts.json"
+
+
+def _store_root() -> Path:
+    if not settings.dataset_store_dir:
+        raise RuntimeError(
+            "Precomputed forecasts live in the dataset store; set AGRIPULSE_DATASET_STORE."
+        )
+    return Path(settings.dataset_store_dir)
+
+
+@lru_cache(maxsize=2)
+def _load_forecasts(root: str, version: str) -> tuple[dict[str, Any] | None, ...]:
+    path = Path(root) / version / FORECASTS_FILE
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No precomputed forecasts for dataset version {version}. Build them with "
+            "'python -m app.services.forecast_store build'."
+        )
+
+    document = json.loads(path.read_text(encoding="utf-8"))
+    entries: list[dict[str, Any] | None] = []
+    for entry in document["series"]:
+        if entry is not None:
+            for point in entry["forecast"]:
+                point["ds"] = date.fromisoformat(point["ds"])
+        entries.append(entry)
+    return tuple(entries)
+
+
+def precomputed_forecast(
+    state: str | None,
+    market: str,
+    commodity: str,
+) -> dict[str, Any]:
+    store, index = find_exact_series(state=state, market=market, commodity=commodity)
+    if index is None:
+        raise ValueError(
+            f"No precomputed forecast for commodity='{commodity}' and market='{market}'; "
+            "only exact market series are precomputed."
+        )
+
+    entry = _load_forecasts(str(_store_root()), store.version)[index]
+    if entry is None:
+        raise ValueError(
+            f"Forecast for commodity='{commodity}' and market='{market}' could not be "
+            "precomputed for this dataset version."
+        )
+    return entry
+
+
+def _forecast_one(commodity: str, state: str, market: str) -> dict[str, Any] | None:
+    from app.services.series_forecast import forecast_series
+
+    history = load_prophet_history(state=state, market=market, commodity=commodity)
+    try:
+        result = forecast_series(
+            state=state,
+            market=market,
+            commodity=commodity,
+            history=history,
+            priority="background",
+            bounded=False,
+        )
+    except (RuntimeError, ValueError):
+        return None
+
+    return {
+        "forecast": [{**point, "ds": point["ds"].isoformat()} for point in result["forecast"]],
+        "model": result["model"],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.forecast_store",
+        description="Precompute forecasts for every series in the current dataset store.",
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Fit every series and write forecasts.json.")
+    build.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if settings.serving_mode == "slim":
+        parser.error("Run the precompute step in full mode; slim mode cannot fit models.")
+
+    root = _store_root()
+    store = get_price_store()
+    series = store.series()
+    entries: list[dict[str, Any] | None] = [None] * len(series)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(_forecast_one, commodity, state, market): index
+            for index, (commodity, state, market) in enumerate(series)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            entries[futures[future]] = future.result()
+            print(f"\r{done}/{len(futures)} series forecast", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    target = root / store.version / FORECASTS_FILE
+    staging = target.with_suffix(".tmp")
+    staging.write_text(
+        json.dumps({"version": store.version, "series": entries}),
+        encoding="utf-8",
+    )
+    os.replace(staging, target)
+
+    failed = sum(entry is None for entry in entries)
+    print(f"Wrote {len(entries) - failed} forecasts ({failed} failed) to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
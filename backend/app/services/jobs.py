@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Literal, TypedDict
+
+from app.core.exceptions import AmbiguousNameError, DataNotFoundError, ForecastError
+from app.core.logger import logger
+
+JobState = Literal["queued", "running", "succeeded", "failed"]
+ErrorKind = Literal["not_found", "ambiguous", "forecast", "internal"]
+ProgressCallback = Callable[[int, int], None]
+JobFunction = Callable[[ProgressCallback], dict[str, Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    error_kind TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+"""
+
+
+class JobRecord(TypedDict):
+    job_id: str
+    kind: str
+    status: JobState
+    params: dict[str, Any]
+    progress_done: int
+    progress_total: int
+    result: dict[str, Any] | None
+    error: str | None
+    error_kind: ErrorKind | None
+    created_at: float
+    updated_at: float
+    expires_at: float
+
+
+def _error_kind(exc: Exception) -> ErrorKind:
+    if isinstance(exc, DataNotFoundError):
+        return "not_found"
+    if isinstance(exc, AmbiguousNameError):
+        return "ambiguous"
+    if isinstance(exc, ForecastError):
+        return "forecast"
+    return "internal"
+
+
+class JobStore:
+    # SQLite keeps job state visible to every uvicorn worker on the host.
+    def __init__(self, path: Path, retention_seconds: int) -> None:
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _execute(self, sql: str, params: tuple[Any, ...]) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(sql, params)
+
+    def create(self, kind: str, params: dict[str, Any]) -> JobRecord:
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (job_id, kind, status, params, created_at, updated_at, expires_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(params), now, now, now + self.retention_seconds),
+        )
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "params": params,
+            "progress_done": 0,
+            "progress_total": 0,
+            "result": None,
+            "error": None,
+            "error_kind": None,
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": now + self.retention_seconds,
+        }
+
+    def mark_running(self, job_id: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ?",
+            (time.time(), job_id),
+        )
+
+    def update_progress(self, job_id: str, done: int, total: int) -> None:
+        self._execute(
+            "UPDATE jobs SET progress_done = ?, progress_total = ?, updated_at = ? "
+            "WHERE job_id = ?",
+            (done, total, time.time(), job_id),
+        )
+
+    def finish(self, job_id: str, result: dict[str, Any]) -> None:
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = 'succeeded', result = ?, updated_at = ?, expires_at = ? "
+            "WHERE job_id = ?",
+            (json.dumps(result, default=str), now, now + self.retention_seconds, job_id),
+        )
+
+    def fail(self, job_id: str, error: str, error_kind: ErrorKind) -> None:
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, error_kind = ?, updated_at = ?, "
+            "expires_at = ? WHERE job_id = ?",
+            (error, error_kind, now, now + self.retention_seconds, job_id),
+        )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+
+        record: JobRecord = dict(row)
+        record["params"] = json.loads(record["params"])
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        return record
+
+    def purge_expired(self) -> int:
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+
+class JobManager:
+    def __init__(self, store: JobStore, workers: int) -> None:
+        self.store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers),
+            thread_name_prefix="agripulse-job",
+        )
+        self._purge_lock = threading.Lock()
+
+    def submit(self, kind: str, params: dict[str, Any], func: JobFunction) -> JobRecord:
+        with self._purge_lock:
+            self.store.purge_expired()
+        record = self.store.create(kind, params)
+        self._executor.submit(self._run, record["job_id"], func)
+        logger.info("Job queued | id=%s | kind=%s", record["job_id"], kind)
+        return record
+
+    def get(self, job_id: str) -> JobRecord | None:
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str, func: JobFunction) -> None:
+        self.store.mark_running(job_id)
+
+        def report(done: int, total: int) -> None:
+            self.store.update_progress(job_id, done, total)
+
+        try:
+            result = func(report)
+        except Exception as exc:
+            logger.exception("Job failed | id=%s | error=%s", job_id, exc)
+            self.store.fail(job_id, str(exc), _error_kind(exc))
+            return
+
+        self.store.finish(job_id, result)
+        logger.info("Job finished | id=%s", job_id)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+
+FORECAST_HORIZON_DAYS = 7
+MIN_HISTORY_ROWS = 14
+# Matches Prophet's default interval_width of 0.80.
+INTERVAL_Z = 1.2816
+HOLT_ALPHAS = (0.2, 0.5, 0.8)
+HOLT_BETAS = (0.05, 0.2)
+HOLT_DAMPING = 0.98
+
+
+def _to_finite_float(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
+
+
+def _to_day(value: Any) -> np.datetime64 | None:
+    if hasattr(value, "to_pydatetime"):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime):
+        value = value.date()
+    try:
+        if isinstance(value, date):
+            return np.datetime64(value, "D")
+        if isinstance(value, (str, np.datetime64)):
+            return np.datetime64(value, "D")
+    except ValueError:
+        return None
+    return None
+
+
+def prepare_history(
+    history: list[dict[str, Any]],
+    min_rows: int = MIN_HISTORY_ROWS,
+) -> tuple[np.ndarray, np.ndarray]:
+    if not history:
+        raise ValueError("Historical dataset is empty for this selection; cannot run forecasting.")
+
+    days: list[np.datetime64] = []
+    values: list[float] = []
+    for row in history:
+        day = _to_day(row.get("ds"))
+        price = _to_finite_float(row.get("y"))
+        if day is None or price is None:
+            continue
+        days.append(day)
+        values.append(price)
+
+    day_array = np.asarray(days, dtype="datetime64[D]")
+    value_array = np.asarray(values, dtype=np.float64)
+    order = np.argsort(day_array, kind="stable")
+    day_array, value_array = day_array[order], value_array[order]
+
+    if len(day_array):
+        # Same rule as the Prophet path: keep the last observation of each day.
+        keep = np.append(day_array[1:] != day_array[:-1], True)
+        day_array, value_array = day_array[keep], value_array[keep]
+
+    if len(day_array) < min_rows:
+        raise ValueError(
+            f"Need at least {min_rows} valid history rows for forecasting; found {len(day_array)}."
+        )
+    return day_array, value_array
+
+
+def fill_daily(days: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # Forward-fill onto a gap-free daily grid from the first to the last observation.
+    offsets = (days - days[0]).astype(np.int64)
+    grid = np.full(int(offsets[-1]) + 1, np.nan)
+    grid[offsets] = values
+    filled_index = np.maximum.accumulate(np.where(np.isnan(grid), 0, np.arange(len(grid))))
+    return grid[filled_index]
+
+
+def _format_points(
+    last_day: np.datetime64,
+    yhat: np.ndarray,
+    spread: np.ndarray,
+) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for step, (center, width) in enumerate(zip(yhat.tolist(), spread.tolist()), start=1):
+        ds_value = (last_day + np.timedelta64(step, "D")).astype(date)
+        results.append(
+            {
+                "ds": ds_value,
+                "yhat": float(center),
+                "yhat_lower": float(center - width),
+                "yhat_upper": float(center + width),
+            }
+        )
+    return results
+
+
+def _horizon_spread(residuals: np.ndarray) -> np.ndarray:
+    finite = residuals[np.isfinite(residuals)]
+    sigma = float(np.std(finite)) if len(finite) > 1 else 0.0
+    steps = np.arange(1, FORECAST_HORIZON_DAYS + 1)
+    return INTERVAL_Z * sigma * np.sqrt(steps)
+
+
+def run_naive_forecast(
+    history: list[dict[str, Any]],
+    periods: int = FORECAST_HORIZON_DAYS,
+) -> list[dict[str, Any]]:
+    days, values = prepare_history(history)
+    _ = periods  # Horizon is fixed at 7 days, like the Prophet path.
+
+    grid = fill_daily(days, values)
+    yhat = np.full(FORECAST_HORIZON_DAYS, grid[-1])
+    return _format_points(days[-1], yhat, _horizon_spread(np.diff(grid)))
+
+
+def run_seasonal_naive_forecast(
+    history: list[dict[str, Any]],
+    periods: int = FORECAST_HORIZON_DAYS,
+) -> list[dict[str, Any]]:
+    days, values = prepare_history(history)
+    _ = periods
+
+    grid = fill_daily(days, values)
+    season = 7
+    if len(grid) < 2 * season:
+        return run_naive_forecast(history, periods)
+
+    last_week = grid[-season:]
+    yhat = np.resize(last_week, FORECAST_HORIZON_DAYS)
+    residuals = grid[season:] - grid[:-season]
+    steps = np.arange(FORECAST_HORIZON_DAYS) // season + 1
+    spread = _horizon_spread(residuals)[0] * np.sqrt(steps)
+    return _format_points(days[-1], yhat, spread)
+
+
+def _holt_filter(
+    grid: np.ndarray,
+    alphas: np.ndarray,
+    betas: np.ndarray,
+    damping: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Runs every (alpha, beta) candidate side by side; returns final level/trend and SSE.
+    level = np.full(alphas.shape, grid[0])
+    trend = np.full(alphas.shape, grid[1] - grid[0])
+    sse = np.zeros(alphas.shape)
+    for value in grid[1:]:
+        predicted = level + damping * trend
+        error = value - predicted
+        sse += error * error
+        new_level = predicted + alphas * error
+        trend = damping * trend + betas * (new_level - level - damping * trend)
+        level = new_level
+    return level, trend, sse
+
+
+def run_holt_forecast(
+    history: list[dict[str, Any]],
+    periods: int = FORECAST_HORIZON_DAYS,
+) -> list[dict[str, Any]]:
+    days, values = prepare_history(history)
+    _ = periods
+
+    grid = fill_daily(days, values)
+    alpha_grid, beta_grid = np.meshgrid(HOLT_ALPHAS, HOLT_BETAS)
+    alphas, betas = alpha_grid.ravel(), beta_grid.ravel()
+    level, trend, sse = _holt_filter(grid, alphas, betas, HOLT_DAMPING)
+
+    best = int(np.argmin(sse))
+    steps = np.arange(1, FORECAST_HORIZON_DAYS + 1)
+    damped_steps = np.cumsum(HOLT_DAMPING**steps)
+    yhat = level[best] + damped_steps * trend[best]
+
+    sigma = math.sqrt(float(sse[best]) / max(1, len(grid) - 1))
+    spread = INTERVAL_Z * sigma * np.sqrt(steps)
+    return _format_points(days[-1], yhat, spread)
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import math
-from typing import Any
+from concurrent.futures import Future, as_completed
+from typing import Any, Callable
 
-from app.services.crop_prices import _load_rows, load_prophet_history
-from app.services.forecast_model import run_prophet_forecast
-
-
-def _norm(value: str | None) -> str:
-    return (value or "").strip().casefold()
+from app.services.crop_prices import (
+    load_prophet_history,
+    markets_for_state_and_commodity,
+    resolve_name,
+)
+from app.services.scheduler import Priority
+from app.services.series_forecast import submit_series_forecast
 
 
 def _to_finite_float(value: Any) -> float | None:
@@ -21,19 +23,6 @@ def _to_finite_float(value: Any) -> float | None:
     return number
 
 
-def _markets_for_state_and_commodity(state: str, commodity: str) -> list[str]:
-    state_norm = _norm(state)
-    commodity_norm = _norm(commodity)
-    markets = {
-        str(row.get("Market", "")).strip()
-        for row in _load_rows()
-        if _norm(str(row.get("State", ""))) == state_norm
-        and _norm(str(row.get("Commodity", ""))) == commodity_norm
-    }
-    markets.discard("")
-    return sorted(markets)
-
-
 def _expected_gain_percent(forecast: list[dict[str, Any]]) -> float | None:
     if len(forecast) < 2:
         return None
@@ -54,19 +43,50 @@ def select_best_mandis(
     commodity: str,
     days: int = 7,
     limit: int = 3,
+    on_progress: Callable[[int, int], None] | None = None,
+    priority: Priority = "comparison",
 ) -> dict[str, Any]:
-    markets = _markets_for_state_and_commodity(state, commodity)
+    state = resolve_name("state", state)
+    commodity = resolve_name("commodity", commodity)
+    markets = markets_for_state_and_commodity(state, commodity)
     if not markets:
         raise ValueError(
             f"No markets found for state='{state}' and commodity='{commodity}'."
         )
 
-    ranked: list[dict[str, Any]] = []
+    # Fan every market out to the scheduler at once, then rank as fits complete.
+    pending: dict[Future, str] = {}
+    failed = 0
     for market in markets:
         try:
             history = load_prophet_history(state=state, market=market, commodity=commodity)
-            forecast = run_prophet_forecast(history, periods=days)
-        except (ValueError, RuntimeError):
+            future = submit_series_forecast(
+                state=state,
+                market=market,
+                commodity=commodity,
+                history=history,
+                periods=days,
+                priority=priority,
+            )
+        except ValueError:
+            continue
+        except RuntimeError:
+            failed += 1
+            continue
+        pending[future] = market
+
+    ranked: list[dict[str, Any]] = []
+    skipped = len(markets) - len(pending)
+    for done, future in enumerate(as_completed(pending), start=skipped):
+        if on_progress is not None:
+            on_progress(done, len(markets))
+        try:
+            forecast = future.result()["forecast"]
+        except ValueError:
+            continue
+        except RuntimeError:
+            # Failed fits, open breakers and dropped tasks are transient, unlike bad data.
+            failed += 1
             continue
 
         gain = _expected_gain_percent(forecast)
@@ -75,20 +95,26 @@ def select_best_mandis(
 
         ranked.append(
             {
-                "mandi": market,
+                "mandi": pending[future],
                 "expected_change_percent": round(gain, 2),
             }
         )
 
+    if on_progress is not None:
+        on_progress(len(markets), len(markets))
+
     if not ranked:
         raise ValueError(
             f"Unable to compute market comparison for state='{state}' and commodity='{commodity}'."
         )
 
-    ranked.sort(key=lambda item: item["expected_change_percent"], reverse=True)
+    # Fits finish out of order; break ties by market order so rankings stay deterministic.
+    position = {market: index for index, market in enumerate(markets)}
+    ranked.sort(key=lambda item: (-item["expected_change_percent"], position[item["mandi"]]))
     safe_limit = max(1, int(limit))
     return {
         "state": state,
         "commodity": commodity,
         "best_mandis": ranked[:safe_limit],
+        "failed_markets": failed,
     }
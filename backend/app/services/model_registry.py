@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Callable
+
+from app.services.forecast_model import run_prophet_forecast
+from app.services.light_models import (
+    run_holt_forecast,
+    run_naive_forecast,
+    run_seasonal_naive_forecast,
+)
+
+ForecastModel = Callable[[list[dict[str, Any]], int], list[dict[str, Any]]]
+
+DEFAULT_MODEL = "prophet"
+
+# Prophet constructor overrides per fidelity level; "full" is the library default.
+PROPHET_FIDELITY: dict[str, dict[str, Any]] = {
+    "full": {},
+    "fast": {
+        "uncertainty_samples": 200,
+        "n_changepoints": 10,
+        "yearly_seasonality": False,
+    },
+    "minimal": {
+        "uncertainty_samples": 100,
+        "n_changepoints": 5,
+        "yearly_seasonality": False,
+        "weekly_seasonality": False,
+    },
+}
+
+MODEL_REGISTRY: dict[str, ForecastModel] = {
+    "prophet": run_prophet_forecast,
+    "prophet_fast": partial(run_prophet_forecast, options=PROPHET_FIDELITY["fast"]),
+    "prophet_minimal": partial(run_prophet_forecast, options=PROPHET_FIDELITY["minimal"]),
+    "holt": run_holt_forecast,
+    "seasonal_naive": run_seasonal_naive_forecast,
+    "naive": run_naive_forecast,
+}
+
+
+def get_forecast_model(name: str) -> ForecastModel:
+    try:
+        return MODEL_REGISTRY[name]
+    except KeyError as exc:
+        raise ValueError(
+            f"Unknown forecast model '{name}'. Available: {', '.join(sorted(MODEL_REGISTRY))}."
+        ) from exc
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import TypedDict
+
+from app.core.config import settings
+from app.services.model_registry import DEFAULT_MODEL
+
+MIN_PROPHET_LENGTH = 90
+MAX_PROPHET_GAP_RATIO = 0.5
+STABLE_CV = 0.02
+SEASONAL_STRENGTH = 0.3
+
+
+class RoutingDecision(TypedDict):
+    name: str
+    reason: str
+
+
+def route_series(features: dict[str, float]) -> RoutingDecision:
+    if not settings.forecast_routing_enabled:
+        return {"name": DEFAULT_MODEL, "reason": "Routing disabled; using the default model."}
+
+    light_model = settings.routing_light_model
+    length = int(features.get("length", 0))
+    cv = features.get("cv", 0.0)
+    seasonality = features.get("seasonality_strength", 0.0)
+    gap_ratio = features.get("gap_ratio", 0.0)
+
+    if length < MIN_PROPHET_LENGTH:
+        return {
+            "name": light_model,
+            "reason": f"Short history ({length} days < {MIN_PROPHET_LENGTH}).",
+        }
+    if gap_ratio > MAX_PROPHET_GAP_RATIO:
+        return {
+            "name": light_model,
+            "reason": f"Sparse history ({gap_ratio:.0%} of days missing).",
+        }
+    if seasonality >= SEASONAL_STRENGTH:
+        return {
+            "name": DEFAULT_MODEL,
+            "reason": f"Weekly seasonality strength {seasonality:.2f} >= {SEASONAL_STRENGTH}.",
+        }
+    if cv < STABLE_CV:
+        return {
+            "name": light_model,
+            "reason": f"Stable prices (CV {cv:.1%} < {STABLE_CV:.0%}).",
+        }
+    return {
+        "name": DEFAULT_MODEL,
+        "reason": f"Volatile long history (CV {cv:.1%}, {length} days).",
+    }
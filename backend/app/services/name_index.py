@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Literal, TypedDict
+
+NameKind = Literal["commodity", "state", "market"]
+NAME_KINDS: tuple[NameKind, ...] = ("commodity", "state", "market")
+
+
+class NameSuggestion(TypedDict):
+    name: str
+    kind: NameKind
+    score: int
+
+
+def _norm(value: str | None) -> str:
+    return " ".join((value or "").casefold().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def _max_edits(text: str) -> int:
+    return 1 if len(text) <= 5 else 2
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    # Levenshtein distance, abandoned as soon as every cell in a row exceeds `limit`.
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous = list(range(len(right) + 1))
+    for row, left_char in enumerate(left, start=1):
+        current = [row]
+        for column, right_char in enumerate(right, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (left_char != right_char),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    # Sorted keys stand in for a trie: a prefix is one bisect plus a forward scan.
+    # Keys are each full normalized name and each of its words.
+    def __init__(self, kind: NameKind, labels: tuple[str, ...]) -> None:
+        self.kind = kind
+        self.names: list[str] = []
+        self._by_norm: dict[str, int] = {}
+        for label in labels:
+            key = _norm(label)
+            if key and key not in self._by_norm:
+                self._by_norm[key] = len(self.names)
+                self.names.append(label)
+
+        self._tokens: list[tuple[str, ...]] = [
+            tuple(_norm(name).split()) for name in self.names
+        ]
+        entries = sorted(
+            {(key, name_id) for key, name_id in self._by_norm.items()}
+            | {
+                (token, name_id)
+                for name_id, tokens in enumerate(self._tokens)
+                for token in tokens
+            }
+        )
+        self._keys = [key for key, _ in entries]
+        self._key_names = [name_id for _, name_id in entries]
+
+        self._grams: dict[str, set[int]] = {}
+        for key, name_id in entries:
+            for gram in _trigrams(key):
+                self._grams.setdefault(gram, set()).add(name_id)
+
+    def _prefix_matches(self, query: str) -> dict[int, int]:
+        # name id -> 1 when the full name starts with the query, 2 when one of its words does.
+        matches: dict[int, int] = {}
+        position = bisect_left(self._keys, query)
+        while position < len(self._keys) and self._keys[position].startswith(query):
+            name_id = self._key_names[position]
+            score = 1 if _norm(self.names[name_id]).startswith(query) else 2
+            matches[name_id] = min(score, matches.get(name_id, score))
+            position += 1
+        return matches
+
+    def _fuzzy_matches(self, query: str) -> dict[int, int]:
+        # name id -> edit distance against the start of the full name or its closest word.
+        limit = _max_edits(query)
+        candidates: set[int] = set()
+        for gram in _trigrams(query):
+            candidates |= self._grams.get(gram, set())
+
+        matches: dict[int, int] = {}
+        for name_id in candidates:
+            keys = (_norm(self.names[name_id]), *self._tokens[name_id])
+            distance = min(edit_distance(query, key[: len(query)], limit) for key in keys)
+            if distance <= limit:
+                matches[name_id] = distance
+        return matches
+
+    def suggest(self, query: str, limit: int = 10) -> list[NameSuggestion]:
+        query = _norm(query)
+        if not query:
+            return []
+
+        scores = {name_id: 0 for name_id in (self._by_norm.get(query),) if name_id is not None}
+        for name_id, score in self._prefix_matches(query).items():
+            scores.setdefault(name_id, score)
+        if len(query) >= 3:
+            for name_id, distance in self._fuzzy_matches(query).items():
+                scores.setdefault(name_id, 3 + distance)
+
+        ranked = sorted(scores.items(), key=lambda item: (item[1], len(self.names[item[0]])))
+        return [
+            {"name": self.names[name_id], "kind": self.kind, "score": score}
+            for name_id, score in ranked[:limit]
+        ]
+
+    def partial_matches(self, value: str | None) -> list[str]:
+        # Names containing every word of `value` ("Azadpur" -> "Delhi Azadpur").
+        words = set(_norm(value).split())
+        if not words:
+            return []
+        return [
+            self.names[name_id]
+            for name_id, tokens in enumerate(self._tokens)
+            if words <= set(tokens)
+        ]
+
+    def resolve(self, value: str | None) -> str | None:
+        # Canonical label for an exact or unique whole-word partial name. Near-misses are never
+        # resolved: "Tomato" is one edit from "Potato" but a different crop.
+        query = _norm(value)
+        if not query:
+            return None
+        exact = self._by_norm.get(query)
+        if exact is not None:
+            return self.names[exact]
+
+        partial = self.partial_matches(query)
+        return partial[0] if len(partial) == 1 else None
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.dataset_store import PriceStore
+
+CUBE_STATISTICS = ("median", "mean", "minimum", "maximum", "count")
+CUBE_ARRAYS = ("keys", "bounds", "days", *CUBE_STATISTICS)
+CUBE_LABELS_FILE = "cube_labels.json"
+NATIONAL = -1
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().casefold()
+
+
+def _normalized_codes(labels: tuple[str, ...]) -> tuple[tuple[str, ...], np.ndarray]:
+    # Labels differing only in case or whitespace share a cube key, as in PriceStore lookups.
+    positions: dict[str, int] = {}
+    names: list[str] = []
+    codes = np.empty(len(labels), dtype=np.int32)
+    for code, label in enumerate(labels):
+        key = _norm(label)
+        if key not in positions:
+            positions[key] = len(names)
+            names.append(label)
+        codes[code] = positions[key]
+    return tuple(names), codes
+
+
+@dataclass(frozen=True)
+class PriceCube:
+    # One daily aggregate series per (commodity, state) and per (commodity, national);
+    # each group is a contiguous, date-sorted slice of the statistic arrays.
+    keys: np.ndarray
+    bounds: np.ndarray
+    days: np.ndarray
+    median: np.ndarray
+    mean: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    count: np.ndarray
+    commodities: tuple[str, ...]
+    states: tuple[str, ...]
+
+    @property
+    def group_count(self) -> int:
+        return int(self.keys.shape[0])
+
+    @cached_property
+    def _lookup(self) -> dict[tuple[str, str | None], int]:
+        lookup: dict[tuple[str, str | None], int] = {}
+        for index, (commodity, state) in enumerate(self.keys.tolist()):
+            state_key = _norm(self.states[state]) if state != NATIONAL else None
+            lookup[(_norm(self.commodities[commodity]), state_key)] = index
+        return lookup
+
+    def group_index(self, commodity: str, state: str | None = None) -> int | None:
+        # `None` selects the national aggregate.
+        return self._lookup.get((_norm(commodity), _norm(state) if state is not None else None))
+
+    def group_labels(self, index: int) -> tuple[str, str | None]:
+        commodity, state = self.keys[index].tolist()
+        return self.commodities[commodity], self.states[state] if state != NATIONAL else None
+
+    def group(self, index: int) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        start, stop = self.bounds[index].tolist()
+        return self.days[start:stop], {
+            name: getattr(self, name)[start:stop] for name in CUBE_STATISTICS
+        }
+
+
+def build_price_cube(store: PriceStore) -> PriceCube:
+    commodity_labels, commodity_codes = _normalized_codes(store.commodities)
+    state_labels, state_codes = _normalized_codes(store.states)
+
+    lengths = store.series_bounds[:, 1] - store.series_bounds[:, 0]
+    row_commodities = np.repeat(commodity_codes[store.series_keys[:, 0]], lengths)
+    row_states = np.repeat(state_codes[store.series_keys[:, 1]], lengths)
+    days = np.asarray(store.days)
+    prices = np.asarray(store.prices, dtype=np.float64)
+
+    # Every row counts once towards its state and once towards the national aggregate.
+    commodities = np.concatenate((row_commodities, row_commodities))
+    states = np.concatenate((row_states, np.full(len(row_states), NATIONAL, dtype=np.int32)))
+    days = np.concatenate((days, days))
+    prices = np.concatenate((prices, prices))
+
+    order = np.lexsort((prices, days, states, commodities))
+    commodities, states, days, prices = (
+        commodities[order],
+        states[order],
+        days[order],
+        prices[order],
+    )
+
+    if len(prices):
+        changed = (
+            (commodities[1:] != commodities[:-1])
+            | (states[1:] != states[:-1])
+            | (days[1:] != days[:-1])
+        )
+        starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+    else:
+        starts = np.empty(0, dtype=np.int64)
+    counts = np.diff(np.append(starts, len(prices)))
+
+    # Prices are sorted within each (commodity, state, day) cell, so order statistics are lookups.
+    median = (prices[starts + (counts - 1) // 2] + prices[starts + counts // 2]) / 2
+    mean = np.add.reduceat(prices, starts) / counts if len(starts) else np.empty(0)
+    cell_commodities = commodities[starts]
+    cell_states = states[starts]
+
+    if len(starts):
+        group_changed = (cell_commodities[1:] != cell_commodities[:-1]) | (
+            cell_states[1:] != cell_states[:-1]
+        )
+        group_starts = np.concatenate(([0], np.flatnonzero(group_changed) + 1))
+    else:
+        group_starts = np.empty(0, dtype=np.int64)
+    group_stops = np.append(group_starts[1:], len(starts))
+
+    return PriceCube(
+        keys=np.column_stack(
+            (cell_commodities[group_starts], cell_states[group_starts])
+        ).astype(np.int32),
+        bounds=np.column_stack((group_starts, group_stops)).astype(np.int64),
+        days=np.ascontiguousarray(days[starts]),
+        median=np.ascontiguousarray(median),
+        mean=np.ascontiguousarray(mean),
+        minimum=np.ascontiguousarray(prices[starts]),
+        maximum=np.ascontiguousarray(prices[starts + counts - 1]),
+        count=counts.astype(np.int64),
+        commodities=commodity_labels,
+        states=state_labels,
+    )
+
+
+def save_price_cube(cube: PriceCube, directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in CUBE_ARRAYS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(cube, name)))
+    labels = {"commodities": list(cube.commodities), "states": list(cube.states)}
+    (directory / CUBE_LABELS_FILE).write_text(json.dumps(labels), encoding="utf-8")
+
+
+def load_price_cube(directory: Path) -> PriceCube:
+    labels = json.loads((directory / CUBE_LABELS_FILE).read_text(encoding="utf-8"))
+    return PriceCube(
+        **{name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in CUBE_ARRAYS},
+        commodities=tuple(labels["commodities"]),
+        states=tuple(labels["states"]),
+    )
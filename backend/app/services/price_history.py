@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Literal
+
+import numpy as np
+
+from app.core.exceptions import AmbiguousMarketError
+from app.services.crop_prices import get_price_store, resolve_name
+
+Downsample = Literal["lttb", "week", "month"]
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().casefold()
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: keep the endpoints, then from each bucket the point
+    # spanning the largest triangle with the previous pick and the next bucket's centroid.
+    size = len(x)
+    if threshold < 3 or threshold >= size:
+        return np.arange(size)
+
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        centroid_x = x[stop:next_stop].mean()
+        centroid_y = y[stop:next_stop].mean()
+        area = np.abs(
+            (x[previous] - centroid_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (centroid_y - y[previous])
+        )
+        previous = int(start + np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def ohlc_buckets(
+    days: np.ndarray,
+    prices: np.ndarray,
+    bucket: Literal["week", "month"],
+) -> dict[str, np.ndarray]:
+    if bucket == "week":
+        # datetime64 day 0 is a Thursday; shift every day back to its ISO-week Monday.
+        weekday = (days.astype(np.int64) + 3) % 7
+        keys = days - weekday.astype("timedelta64[D]")
+    else:
+        keys = days.astype("datetime64[M]").astype("datetime64[D]")
+
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    stops = np.append(starts[1:], len(days))
+    return {
+        "start": keys[starts],
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[stops - 1],
+        "count": stops - starts,
+    }
+
+
+def query_price_history(
+    crop: str,
+    mandi: str,
+    state: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    downsample: Downsample | None = None,
+    points: int = 500,
+) -> dict[str, Any]:
+    crop = resolve_name("commodity", crop)
+    mandi = resolve_name("market", mandi)
+    store = get_price_store()
+    if _norm(state):
+        state = resolve_name("state", state)
+    else:
+        # Same-name markets in different states are separate series; never merge them.
+        states = sorted(store.states_for_market(mandi, commodity=crop))
+        if len(states) > 1:
+            raise AmbiguousMarketError(
+                f"Market '{mandi}' has {crop} prices in several states; pass `state` to pick one.",
+                states=states,
+            )
+        state = states[0] if states else None
+    days, prices = store.select(
+        crop,
+        state=state if _norm(state) else None,
+        market=mandi,
+    )
+    lower = np.searchsorted(days, np.datetime64(start, "D")) if start else 0
+    upper = np.searchsorted(days, np.datetime64(end, "D"), side="right") if end else len(days)
+    days, prices = days[lower:upper], prices[lower:upper]
+    if not len(days):
+        raise ValueError(
+            f"No price history for commodity='{crop}' and market='{mandi}' in the requested range."
+        )
+
+    result: dict[str, Any] = {
+        "crop": crop,
+        "mandi": mandi,
+        "state": state,
+        "downsample": downsample or "none",
+        "source_points": len(days),
+        "points": [],
+        "buckets": [],
+    }
+    if downsample in ("week", "month"):
+        columns = ohlc_buckets(days, prices, downsample)
+        names = tuple(columns)
+        result["buckets"] = [
+            dict(zip(names, values))
+            for values in zip(*(column.tolist() for column in columns.values()))
+        ]
+        return result
+
+    if downsample == "lttb":
+        keep = lttb_indices(days.astype(np.int64).astype(np.float64), prices, points)
+        days, prices = days[keep], prices[keep]
+    result["points"] = [
+        {"date": day, "price": price} for day, price in zip(days.tolist(), prices.tolist())
+    ]
+    return result
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.exceptions import AmbiguousNameError, DataNotFoundError, ForecastError
+from app.core.logger import logger
+from app.schemas import ForecastRequest, PriceSubscription, PriceUpdate
+from app.services.crop_prices import dataset_version, resolve_name
+from app.services.forecast_pipeline import run_forecast_pipeline
+
+QUEUE_SIZE = 256
+
+Pair = tuple[str, str]
+
+
+def log_task_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Task failed | task=%s", task.get_name(), exc_info=task.exception())
+
+
+def pair_update(crop: str, mandi: str) -> dict[str, Any]:
+    try:
+        version = dataset_version()
+        result = run_forecast_pipeline(
+            ForecastRequest(crop=crop, mandi=mandi),
+            priority="comparison",
+        )
+    except (FileNotFoundError, DataNotFoundError, ForecastError) as exc:
+        update = PriceUpdate(type="error", crop=crop, mandi=mandi, detail=str(exc))
+    except Exception:
+        # Subscribers still hear back; `_update` drops error messages so the next refresh retries.
+        logger.exception("Price update failed | crop=%s | mandi=%s", crop, mandi)
+        update = PriceUpdate(
+            type="error",
+            crop=crop,
+            mandi=mandi,
+            detail="Price update failed; it will be retried on the next refresh.",
+        )
+    else:
+        update = PriceUpdate(
+            type="update",
+            crop=result["crop"],
+            mandi=result["mandi"],
+            dataset_version=version,
+            current_price=result["current_price"],
+            shock_alert=result["shock_alert"],
+            forecast=result["forecast"],
+            forecast_model=result["forecast_model"],
+            degraded=result["degraded"],
+        )
+    return update.model_dump(mode="json")
+
+
+class PriceUpdateHub:
+    # Runs on the event loop. Each subscribed (crop, mandi) pair is computed once per dataset
+    # version and fanned out to every connection queue subscribed to it.
+    def __init__(self, poll_seconds: float, max_pairs: int) -> None:
+        self.poll_seconds = poll_seconds
+        self.max_pairs = max_pairs
+        self.computed = 0
+        self.pushed = 0
+        self.dropped = 0
+        self._subscribers: dict[Pair, set[asyncio.Queue]] = {}
+        self._pairs: dict[asyncio.Queue, set[Pair]] = {}
+        self._updates: dict[tuple[str | None, Pair], asyncio.Future] = {}
+        self._version: str | None = None
+        self._watcher: asyncio.Task | None = None
+        # The event loop only keeps weak references to tasks, so the hub holds them until done.
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro: Any) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(log_task_failure)
+        return task
+
+    def connect(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._pairs[queue] = set()
+        if self._watcher is None or self._watcher.done():
+            self._watcher = self._spawn(self._watch())
+        return queue
+
+    def disconnect(self, queue: asyncio.Queue) -> None:
+        for pair in self._pairs.pop(queue, set()):
+            self._unsubscribe(queue, pair)
+        if not self._pairs and self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def _send(self, queue: asyncio.Queue, message: dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client that stops reading loses messages rather than growing server memory.
+            self.dropped += 1
+        else:
+            self.pushed += 1
+
+    def send_error(self, queue: asyncio.Queue, detail: str) -> None:
+        self._send(queue, {"type": "error", "detail": detail})
+
+    def _unsubscribe(self, queue: asyncio.Queue, pair: Pair) -> None:
+        queues = self._subscribers.get(pair)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[pair]
+                self._updates.pop((self._version, pair), None)
+
+    async def handle(self, queue: asyncio.Queue, message: Any) -> None:
+        try:
+            request = PriceSubscription.model_validate(message)
+        except ValidationError as exc:
+            self.send_error(queue, str(exc))
+            return
+
+        try:
+            pairs = await asyncio.to_thread(
+                lambda: [
+                    (resolve_name("commodity", item.crop), resolve_name("market", item.mandi))
+                    for item in request.pairs
+                ]
+            )
+        except (
+            AmbiguousNameError,
+            DataNotFoundError,
+            FileNotFoundError,
+            RuntimeError,
+            ValueError,
+        ) as exc:
+            self.send_error(queue, str(exc))
+            return
+
+        subscribed = self._pairs.get(queue)
+        if subscribed is None:
+            return
+        if request.action == "unsubscribe":
+            for pair in pairs:
+                subscribed.discard(pair)
+                self._unsubscribe(queue, pair)
+        else:
+            added = [pair for pair in dict.fromkeys(pairs) if pair not in subscribed]
+            if len(subscribed) + len(added) > self.max_pairs:
+                self.send_error(queue, f"At most {self.max_pairs} pairs per connection.")
+                return
+            for pair in added:
+                subscribed.add(pair)
+                self._subscribers.setdefault(pair, set()).add(queue)
+                # New subscribers get the current state without waiting for the next refresh.
+                self._spawn(self._deliver(pair, {queue}))
+
+        self._send(
+            queue,
+            {
+                "type": "subscriptions",
+                "pairs": [{"crop": crop, "mandi": mandi} for crop, mandi in sorted(subscribed)],
+            },
+        )
+
+    async def _update(self, pair: Pair) -> dict[str, Any]:
+        key = (self._version, pair)
+        future = self._updates.get(key)
+        if future is None:
+            future = self._spawn(asyncio.to_thread(pair_update, *pair))
+            self._updates[key] = future
+            self.computed += 1
+        try:
+            message = await asyncio.shield(future)
+        except Exception:
+            if self._updates.get(key) is future:
+                del self._updates[key]
+            raise
+        if (message["type"] == "error" or message.get("degraded")) and (
+            self._updates.get(key) is future
+        ):
+            # Not reused: the next subscriber or refresh retries the real model.
+            del self._updates[key]
+        return message
+
+    async def _deliver(self, pair: Pair, queues: set[asyncio.Queue]) -> None:
+        try:
+            message = await self._update(pair)
+        except Exception:
+            logger.exception("Price update failed | crop=%s | mandi=%s", *pair)
+            return
+        for queue in queues:
+            if pair in self._pairs.get(queue, ()):
+                self._send(queue, message)
+
+    async def _watch(self) -> None:
+        while True:
+            version = await self._current_version()
+            if version is not None and version != self._version:
+                self._version = version
+                self._updates = {
+                    key: future for key, future in self._updates.items() if key[0] == version
+                }
+                if self._subscribers:
+                    logger.info(
+                        "Dataset refreshed | version=%s | pushing %s pair(s)",
+                        version,
+                        len(self._subscribers),
+                    )
+                for pair, queues in list(self._subscribers.items()):
+                    self._spawn(self._deliver(pair, set(queues)))
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _current_version(self) -> str | None:
+        try:
+            return await asyncio.to_thread(dataset_version)
+        except (FileNotFoundError, RuntimeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connections": len(self._pairs),
+            "pairs": len(self._subscribers),
+            "dataset_version": self._version,
+            "computed": self.computed,
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+        }
+
+
+price_update_hub = PriceUpdateHub(
+    poll_seconds=settings.push_poll_seconds,
+    max_pairs=settings.push_max_pairs,
+)
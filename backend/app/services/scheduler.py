@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Literal
+
+from app.core.config import settings
+
+Priority = Literal["interactive", "comparison", "background"]
+PRIORITIES: tuple[Priority, ...] = ("interactive", "comparison", "background")
+# Stride-scheduling shares: with all classes busy, interactive gets 8 of every 12 picks.
+PRIORITY_WEIGHTS: dict[str, int] = {"interactive": 8, "comparison": 3, "background": 1}
+PREEMPTIBLE: tuple[Priority, ...] = ("background",)
+
+
+class TaskPreemptedError(RuntimeError):
+    """Raised on a queued low-priority task dropped to make room for other work."""
+
+
+class SchedulerFullError(TaskPreemptedError):
+    """Raised on a task rejected because the queue is full of work that cannot be dropped."""
+
+
+@dataclass
+class _Task:
+    priority: Priority
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _ClassStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    preempted: int = 0
+    rejected: int = 0
+    running: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    started: int = 0
+
+
+class ForecastScheduler:
+    def __init__(self, workers: int, max_queued: int) -> None:
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self._queues: dict[str, deque[_Task]] = {priority: deque() for priority in PRIORITIES}
+        self._passes: dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._virtual_time = 0.0
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._local = threading.local()
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work,
+                name=f"agripulse-scheduler-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _preempt_one(self) -> bool:
+        for priority in reversed(PREEMPTIBLE):
+            queue = self._queues[priority]
+            if queue:
+                task = queue.pop()
+                self._stats[priority].preempted += 1
+                task.future.set_exception(
+                    TaskPreemptedError("Queued background forecast was preempted.")
+                )
+                return True
+        return False
+
+    def submit(
+        self,
+        priority: Priority,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future:
+        if getattr(self._local, "is_worker", False):
+            # Work submitted from inside a task runs inline instead of deadlocking the pool.
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+
+        task = _Task(priority=priority, fn=fn, args=args, kwargs=kwargs)
+        with self._condition:
+            self._ensure_workers()
+            stats = self._stats[priority]
+            stats.submitted += 1
+
+            # `max_queued` bounds every class: queued background work is dropped first, and
+            # only when none is left are new tasks of any priority rejected.
+            if self._queued() >= self.max_queued and not self._preempt_one():
+                stats.rejected += 1
+                if priority in PREEMPTIBLE:
+                    error: TaskPreemptedError = TaskPreemptedError(
+                        "Scheduler queue is full; background task dropped."
+                    )
+                else:
+                    error = SchedulerFullError(
+                        f"Scheduler queue is full ({self.max_queued} forecasts waiting); "
+                        "retry shortly."
+                    )
+                task.future.set_exception(error)
+                return task.future
+
+            queue = self._queues[priority]
+            if not queue:
+                # A class that was idle rejoins at the current virtual time, without banked credit.
+                self._passes[priority] = max(self._passes[priority], self._virtual_time)
+            queue.append(task)
+            self._condition.notify()
+        return task.future
+
+    def run(self, priority: Priority, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self.submit(priority, fn, *args, **kwargs).result()
+
+    def _next_task(self) -> _Task:
+        while True:
+            active = [priority for priority in PRIORITIES if self._queues[priority]]
+            if active:
+                break
+            self._condition.wait()
+
+        chosen = min(
+            active,
+            key=lambda priority: (self._passes[priority], PRIORITIES.index(priority)),
+        )
+        self._virtual_time = self._passes[chosen]
+        self._passes[chosen] += 1.0 / PRIORITY_WEIGHTS[chosen]
+        return self._queues[chosen].popleft()
+
+    def _work(self) -> None:
+        self._local.is_worker = True
+        while True:
+            with self._condition:
+                task = self._next_task()
+                stats = self._stats[task.priority]
+                wait = time.monotonic() - task.enqueued_at
+                stats.started += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                stats.running += 1
+
+            if not task.future.set_running_or_notify_cancel():
+                with self._condition:
+                    stats.running -= 1
+                continue
+
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as exc:
+                task.future.set_exception(exc)
+                outcome = "failed"
+            else:
+                task.future.set_result(result)
+                outcome = "completed"
+
+            with self._condition:
+                stats.running -= 1
+                if outcome == "failed":
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            classes = {}
+            for priority in PRIORITIES:
+                stats = self._stats[priority]
+                queue = self._queues[priority]
+                oldest_wait = time.monotonic() - queue[0].enqueued_at if queue else 0.0
+                classes[priority] = {
+                    "queued": len(queue),
+                    "running": stats.running,
+                    "submitted": stats.submitted,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "preempted": stats.preempted,
+                    "rejected": stats.rejected,
+                    "avg_wait_ms": round(stats.total_wait / stats.started * 1000, 2)
+                    if stats.started
+                    else 0.0,
+                    "max_wait_ms": round(stats.max_wait * 1000, 2),
+                    "oldest_queued_ms": round(oldest_wait * 1000, 2),
+                }
+            return {
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+                "weights": dict(PRIORITY_WEIGHTS),
+                "classes": classes,
+            }
+
+
+forecast_scheduler = ForecastScheduler(
+    workers=settings.scheduler_workers,
+    max_queued=settings.scheduler_max_queued,
+)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from app.services.light_models import fill_daily, prepare_history
+
+FEATURE_NAMES = ("length", "cv", "seasonality_strength", "gap_ratio")
+WEEK = 7
+
+
+def _weekly_seasonality_strength(grid: np.ndarray) -> float:
+    if len(grid) < 4 * WEEK:
+        return 0.0
+
+    # Remove the trend with a centred 7-day mean, then compare the weekday profile
+    # against what is left over (Hyndman's F_S = 1 - Var(R) / Var(S + R)).
+    trend = np.convolve(grid, np.ones(WEEK) / WEEK, mode="valid")
+    detrended = grid[WEEK // 2 : WEEK // 2 + len(trend)] - trend
+    weekdays = np.arange(len(detrended)) % WEEK
+    profile = np.bincount(weekdays, weights=detrended, minlength=WEEK) / np.bincount(
+        weekdays, minlength=WEEK
+    )
+    remainder = detrended - profile[weekdays]
+
+    total_variance = float(np.var(detrended))
+    if total_variance <= 0:
+        return 0.0
+    return max(0.0, 1.0 - float(np.var(remainder)) / total_variance)
+
+
+def compute_series_features(days: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # `days` must be sorted; repeated days keep their last value, as in forecasting.
+    if not len(days):
+        return np.zeros(len(FEATURE_NAMES))
+
+    keep = np.append(days[1:] != days[:-1], True)
+    days, values = days[keep], np.asarray(values[keep], dtype=np.float64)
+
+    length = float(len(days))
+    mean = float(np.mean(values))
+    cv = float(np.std(values) / mean) if mean else 0.0
+    span = int((days[-1] - days[0]).astype(np.int64)) + 1
+    gap_ratio = 1.0 - length / span
+    seasonality = _weekly_seasonality_strength(fill_daily(days, values))
+    return np.array([length, cv, seasonality, gap_ratio])
+
+
+def features_to_dict(features: np.ndarray) -> dict[str, float]:
+    return {name: float(value) for name, value in zip(FEATURE_NAMES, features.tolist())}
+
+
+def history_features(history: list[dict[str, Any]]) -> dict[str, float]:
+    days, values = prepare_history(history, min_rows=1)
+    return features_to_dict(compute_series_features(days, values))
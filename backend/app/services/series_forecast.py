@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Any, Hashable, NotRequired, TypedDict
+
+from app.core.config import settings
+from app.services.access_frequency import series_frequency
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, fit_breakers
+from app.services.crop_prices import get_price_store, series_features
+from app.services.forecast_cache import ForecastCache, forecast_cache
+from app.services.forecast_store import precomputed_forecast
+from app.services.light_models import FORECAST_HORIZON_DAYS
+from app.services.model_registry import get_forecast_model
+from app.services.model_router import RoutingDecision, route_series
+from app.services.scheduler import Priority, TaskPreemptedError, forecast_scheduler
+from app.services.series_features import history_features
+
+BASELINE_MODEL = "naive"
+
+
+class SeriesForecast(TypedDict):
+    forecast: list[dict[str, Any]]
+    model: RoutingDecision
+    degraded: NotRequired[bool]
+
+
+# Last successful fit per series across dataset versions, served when fitting is unhealthy.
+last_good_forecasts = ForecastCache(
+    max_entries=settings.forecast_cache_entries,
+    ttl_seconds=math.inf,
+)
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().casefold()
+
+
+def series_cache_key(state: str | None, market: str, commodity: str) -> Hashable:
+    return (get_price_store().version, _norm(state), _norm(market), _norm(commodity))
+
+
+def is_forecast_cached(state: str | None, market: str, commodity: str) -> bool:
+    if settings.serving_mode == "slim":
+        return True
+    return forecast_cache.contains(series_cache_key(state, market, commodity))
+
+
+def _resolved(func: Any, *args: Any, **kwargs: Any) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _fit_series(
+    cache_key: Hashable,
+    decision: RoutingDecision,
+    history: list[dict[str, Any]],
+    periods: int,
+    breaker: CircuitBreaker | None,
+) -> SeriesForecast:
+    started = time.monotonic()
+    try:
+        model = get_forecast_model(decision["name"])
+        result: SeriesForecast = {"forecast": model(history, periods), "model": decision}
+    except ValueError:
+        # Bad or short input is a problem with this series, not with the model.
+        raise
+    except Exception:
+        if breaker is not None:
+            breaker.record(healthy=False)
+        raise
+    if breaker is not None:
+        # A fit that finishes past the deadline still fills the cache but counts against the model.
+        breaker.record(healthy=time.monotonic() - started <= settings.fit_deadline_seconds)
+    forecast_cache.put(cache_key, result)
+    last_good_forecasts.put(cache_key[1:], result)
+    return result
+
+
+def _release_unrun_trial(breaker: CircuitBreaker, future: Future) -> None:
+    # A trial the scheduler dropped or rejected, or one that hit a data error, records no
+    # outcome, so without this the breaker would stay half-open for good.
+    if future.cancelled() or isinstance(future.exception(), (TaskPreemptedError, ValueError)):
+        breaker.release_trial()
+
+
+def _submit_fit(
+    priority: Priority,
+    cache_key: Hashable,
+    decision: RoutingDecision,
+    history: list[dict[str, Any]],
+    periods: int,
+    bounded: bool,
+) -> Future:
+    if not bounded:
+        # Unbounded fits (jobs, precompute) wait as long as a fit takes, so the breaker neither
+        # judges them against the deadline nor skips them.
+        return forecast_scheduler.submit(
+            priority, _fit_series, cache_key, decision, history, periods, None
+        )
+
+    breaker = fit_breakers.get(decision["name"])
+    admission = breaker.admit()
+    if admission is None:
+        return _resolved(_circuit_open, decision["name"])
+    future = forecast_scheduler.submit(
+        priority, _fit_series, cache_key, decision, history, periods, breaker
+    )
+    if admission == "trial":
+        future.add_done_callback(partial(_release_unrun_trial, breaker))
+    return future
+
+
+def _circuit_open(name: str) -> SeriesForecast:
+    raise CircuitOpenError(f"Model '{name}' is unavailable after repeated slow or failed fits.")
+
+
+def fallback_forecast(
+    state: str | None,
+    market: str,
+    commodity: str,
+    history: list[dict[str, Any]],
+    reason: str,
+) -> SeriesForecast:
+    # Degraded answer: the last good fit for this series, else a naive baseline.
+    last_good = last_good_forecasts.get(series_cache_key(state, market, commodity)[1:])
+    if last_good is not None:
+        return {
+            "forecast": last_good["forecast"],
+            "model": {
+                "name": last_good["model"]["name"],
+                "reason": f"Last successful forecast served because {reason}.",
+            },
+            "degraded": True,
+        }
+
+    model = get_forecast_model(BASELINE_MODEL)
+    return {
+        "forecast": model(history, FORECAST_HORIZON_DAYS),
+        "model": {"name": BASELINE_MODEL, "reason": f"Baseline forecast served because {reason}."},
+        "degraded": True,
+    }
+
+
+def submit_series_forecast(
+    state: str | None,
+    market: str,
+    commodity: str,
+    history: list[dict[str, Any]],
+    periods: int = 7,
+    priority: Priority = "interactive",
+    refresh: bool = False,
+    bounded: bool = True,
+) -> Future:
+    # Cache hits and slim mode resolve immediately; only model fits queue on the scheduler.
+    # `refresh` skips the cache lookup so cache warming replaces an entry that is about to expire.
+    if priority != "background":
+        series_frequency.record((state, market, commodity))
+    if settings.serving_mode == "slim":
+        return _resolved(precomputed_forecast, state=state, market=market, commodity=commodity)
+
+    cache_key = series_cache_key(state, market, commodity)
+    cached = None if refresh else forecast_cache.get(cache_key)
+    if cached is not None:
+        return _resolved(lambda: cached)
+
+    features = series_features(state=state, market=market, commodity=commodity)
+    if features is None:
+        features = history_features(history)
+
+    decision = route_series(features)
+    return _submit_fit(priority, cache_key, decision, history, periods, bounded)
+
+
+def forecast_series(
+    state: str | None,
+    market: str,
+    commodity: str,
+    history: list[dict[str, Any]],
+    periods: int = 7,
+    priority: Priority = "interactive",
+    deadline: float | None = None,
+    fallback: bool = False,
+    bounded: bool = True,
+) -> SeriesForecast:
+    # CHANGED: Single entry point for model selection and fitting of one series.
+    # With `fallback`, a fit that misses `deadline`, fails or is skipped by an open breaker
+    # returns a degraded forecast instead of raising; a late fit still fills the cache.
+    # `bounded=False` bypasses the circuit breaker for callers that wait on every fit.
+    future = submit_series_forecast(
+        state=state,
+        market=market,
+        commodity=commodity,
+        history=history,
+        periods=periods,
+        priority=priority,
+        bounded=bounded,
+    )
+    try:
+        return future.result(timeout=deadline)
+    except FutureTimeoutError:
+        if not fallback:
+            raise
+        reason = f"the model fit exceeded the {deadline:g}s deadline"
+    except CircuitOpenError:
+        if not fallback:
+            raise
+        reason = "the model is paused after repeated slow or failed fits"
+    except (RuntimeError, ValueError) as exc:
+        if not fallback:
+            raise
+        reason = f"the model fit failed ({exc})"
+    return fallback_forecast(state, market, commodity, history, reason)
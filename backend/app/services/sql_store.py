@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.services.dataset_store import PriceStore
+from app.services.price_cube import NATIONAL, PriceCube
+from app.services.series_features import FEATURE_NAMES
+
+APPEND_CHUNK_ROWS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    row_id INTEGER PRIMARY KEY,
+    commodity TEXT NOT NULL,
+    state TEXT NOT NULL,
+    market TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prices_series ON prices (commodity, market, state, day);
+CREATE INDEX IF NOT EXISTS prices_region ON prices (commodity, day, state);
+CREATE TABLE IF NOT EXISTS series (
+    commodity TEXT NOT NULL,
+    state TEXT NOT NULL,
+    market TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (commodity, state, market)
+);
+CREATE TABLE IF NOT EXISTS daily_aggregates (
+    commodity TEXT NOT NULL,
+    state TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    median REAL NOT NULL,
+    mean REAL NOT NULL,
+    minimum REAL NOT NULL,
+    maximum REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (commodity, state, day)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().casefold()
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+_version_connections = threading.local()
+
+
+def _version_connection(path: Path) -> sqlite3.Connection | None:
+    # The version is read on every request, so each thread keeps one connection open instead of
+    # reconnecting. Keyed on the file's inode, so a replaced database is reopened.
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    key = (str(path), stat.st_dev, stat.st_ino)
+    cached = getattr(_version_connections, "cached", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    connection = _connect(path)
+    _version_connections.cached = (key, connection)
+    return connection
+
+
+def read_sql_version(path: Path) -> str | None:
+    connection = _version_connection(path)
+    if connection is None:
+        return None
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+@dataclass(frozen=True)
+class SqlPriceStore(PriceStore):
+    # Only series labels live in memory; each series' rows are one indexed range query.
+    database: str
+    total_rows: int
+    connections: threading.local
+
+    @property
+    def row_count(self) -> int:
+        return self.total_rows
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self.connections, "connection", None)
+        if connection is None:
+            connection = _connect(Path(self.database))
+            self.connections.connection = connection
+        return connection
+
+    def _series_rows(self, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        commodity, state, market = self.series_keys[index].tolist()
+        rows = self._connection().execute(
+            "SELECT day, price, row_id FROM prices "
+            "WHERE commodity = ? AND market = ? AND state = ? ORDER BY day, row_id",
+            (self.commodities[commodity], self.markets[market], self.states[state]),
+        ).fetchall()
+        days, prices, row_ids = zip(*rows) if rows else ((), (), ())
+        return (
+            np.asarray(days, dtype=np.int64).astype("datetime64[D]"),
+            np.asarray(prices, dtype=np.float64),
+            np.asarray(row_ids, dtype=np.int64),
+        )
+
+    @cached_property
+    def price_cube(self) -> PriceCube:
+        rows = self._connection().execute(
+            "SELECT commodity, state, day, median, mean, minimum, maximum, count "
+            "FROM daily_aggregates ORDER BY commodity, state, day"
+        ).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 8
+        commodity_labels, commodity_codes = np.unique(
+            np.asarray(columns[0], dtype=str), return_inverse=True
+        )
+        region_labels = np.asarray(columns[1], dtype=str)
+        state_labels = tuple(sorted(set(region_labels.tolist()) - {""}))
+        state_codes = {label: code for code, label in enumerate(state_labels)}
+        region_codes = np.asarray(
+            [state_codes.get(label, NATIONAL) for label in region_labels.tolist()],
+            dtype=np.int32,
+        )
+
+        keys = np.column_stack((commodity_codes, region_codes)).astype(np.int32)
+        if len(keys):
+            changed = np.any(keys[1:] != keys[:-1], axis=1)
+            starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        stops = np.append(starts[1:], len(keys))
+        return PriceCube(
+            keys=keys[starts].reshape(-1, 2),
+            bounds=np.column_stack((starts, stops)).astype(np.int64),
+            days=np.asarray(columns[2], dtype=np.int64).astype("datetime64[D]"),
+            median=np.asarray(columns[3], dtype=np.float64),
+            mean=np.asarray(columns[4], dtype=np.float64),
+            minimum=np.asarray(columns[5], dtype=np.float64),
+            maximum=np.asarray(columns[6], dtype=np.float64),
+            count=np.asarray(columns[7], dtype=np.int64),
+            commodities=tuple(str(label) for label in commodity_labels),
+            states=state_labels,
+        )
+
+
+def open_sql_store(path: Path) -> SqlPriceStore:
+    version = read_sql_version(path)
+    if not version:
+        raise FileNotFoundError(
+            f"No price database at {path}. Load one with "
+            "'python -m app.services.sql_store append --database PATH FILE...'."
+        )
+
+    with closing(_connect(path)) as connection:
+        series = connection.execute(
+            "SELECT commodity, state, market, rows FROM series ORDER BY commodity, state, market"
+        ).fetchall()
+
+    commodities = tuple(sorted({row[0] for row in series}))
+    states = tuple(sorted({row[1] for row in series}))
+    markets = tuple(sorted({row[2] for row in series}))
+    codes = [
+        {label: code for code, label in enumerate(labels)}
+        for labels in (commodities, states, markets)
+    ]
+    series_keys = np.array(
+        [[codes[column][row[column]] for column in range(3)] for row in series],
+        dtype=np.int32,
+    ).reshape(-1, 3)
+
+    return SqlPriceStore(
+        version=version,
+        days=np.empty(0, dtype="datetime64[D]"),
+        prices=np.empty(0, dtype=np.float64),
+        row_ids=np.empty(0, dtype=np.int64),
+        series_keys=series_keys,
+        series_bounds=np.zeros((len(series), 2), dtype=np.int64),
+        # Features are not maintained incrementally; routing derives them from the history.
+        series_features=np.full((len(series), len(FEATURE_NAMES)), np.nan),
+        commodities=commodities,
+        states=states,
+        markets=markets,
+        database=str(path),
+        total_rows=sum(row[3] for row in series),
+        connections=threading.local(),
+    )
+
+
+def _canonical_labels(connection: sqlite3.Connection) -> dict[str, dict[str, str]]:
+    # New rows reuse an existing label that differs only in case or whitespace.
+    labels: dict[str, dict[str, str]] = {"commodity": {}, "state": {}, "market": {}}
+    for commodity, state, market in connection.execute(
+        "SELECT commodity, state, market FROM series"
+    ):
+        labels["commodity"].setdefault(_norm(commodity), commodity)
+        labels["state"].setdefault(_norm(state), state)
+        labels["market"].setdefault(_norm(market), market)
+    return labels
+
+
+def _refresh_aggregates(
+    connection: sqlite3.Connection,
+    cells: set[tuple[str, int]],
+) -> None:
+    for commodity, day in sorted(cells):
+        rows = connection.execute(
+            "SELECT state, price FROM prices WHERE commodity = ? AND day = ? ORDER BY state",
+            (commodity, day),
+        ).fetchall()
+        by_region: dict[str, list[float]] = {"": []}
+        for state, price in rows:
+            by_region.setdefault(state, []).append(price)
+            by_region[""].append(price)
+
+        connection.executemany(
+            "INSERT OR REPLACE INTO daily_aggregates "
+            "(commodity, state, day, median, mean, minimum, maximum, count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    commodity,
+                    region,
+                    day,
+                    float(np.median(values)),
+                    float(np.mean(values)),
+                    float(np.min(values)),
+                    float(np.max(values)),
+                    len(values),
+                )
+                for region, values in by_region.items()
+                if values
+            ],
+        )
+
+
+def append_files(path: Path, files: list[Path]) -> dict[str, Any]:
+    from app.services.crop_prices import _clean_frame, _pd
+
+    pd = _pd()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    appended = 0
+    with closing(_connect(path)) as connection:
+        connection.executescript(_SCHEMA)
+        version = read_sql_version(path) or ""
+        for file in files:
+            # One transaction per file: a malformed daily file leaves the database untouched.
+            with connection:
+                labels = _canonical_labels(connection)
+                cells: set[tuple[str, int]] = set()
+                counts: dict[tuple[str, str, str], int] = {}
+                for chunk in pd.read_csv(file, chunksize=APPEND_CHUNK_ROWS):
+                    frame = _clean_frame(chunk)
+                    commodities, states, markets = (
+                        [labels[kind].setdefault(_norm(value), value) for value in frame[column]]
+                        for column, kind in (
+                            ("Commodity", "commodity"),
+                            ("State", "state"),
+                            ("Market", "market"),
+                        )
+                    )
+                    days = frame["Date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+                    records = list(
+                        zip(
+                            commodities,
+                            states,
+                            markets,
+                            days.tolist(),
+                            frame["Modal Price"].astype(float).tolist(),
+                        )
+                    )
+                    connection.executemany(
+                        "INSERT INTO prices (commodity, state, market, day, price) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        records,
+                    )
+                    for commodity, state, market, day, _ in records:
+                        cells.add((commodity, day))
+                        key = (commodity, state, market)
+                        counts[key] = counts.get(key, 0) + 1
+                    appended += len(records)
+
+                connection.executemany(
+                    "INSERT INTO series (commodity, state, market, rows) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (commodity, state, market) "
+                    "DO UPDATE SET rows = rows + excluded.rows",
+                    [(*key, count) for key, count in counts.items()],
+                )
+                _refresh_aggregates(connection, cells)
+
+                stat = file.stat()
+                fingerprint = f"{version}:{file.name}:{stat.st_size}:{stat.st_mtime_ns}"
+                version = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,)
+                )
+    return {"version": version, "rows": appended, "files": len(files)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.sql_store",
+        description="Load price CSV files into the indexed SQLite storage backend.",
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    append = subcommands.add_parser(
+        "append", help="Bulk append one or more price CSV files (e.g. daily arrivals)."
+    )
+    append.add_argument("files", nargs="+", type=Path)
+    append.add_argument("--database", type=Path, default=Path(settings.sqlite_path))
+    args = parser.parse_args(argv)
+
+    result = append_files(args.database, args.files)
+    print(
+        f"Appended {result['rows']} rows from {result['files']} file(s) to {args.database} "
+        f"(version {result['version']})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.exceptions import AmbiguousNameError, DataNotFoundError
+from app.services.crop_prices import (
+    markets_for_state_and_commodity,
+    resolve_name,
+    resolve_state_for_market,
+)
+from app.services.series_forecast import is_forecast_cached
+
+# One uncached series fit is the unit of cost for admission control.
+SERIES_FIT_COST = 1.0
+
+
+def _series_cost(state: str | None, market: str, commodity: str) -> float:
+    if is_forecast_cached(state, market, commodity):
+        return settings.cache_hit_cost
+    return SERIES_FIT_COST
+
+
+def estimate_forecast_cost(crop: str, mandi: str) -> float:
+    try:
+        crop, mandi = resolve_name("commodity", crop), resolve_name("market", mandi)
+        state = resolve_state_for_market(mandi)
+        return _series_cost(state, mandi, crop)
+    except (AmbiguousNameError, DataNotFoundError, FileNotFoundError, RuntimeError, ValueError):
+        # Let the pipeline report data problems; charge as a single fit.
+        return SERIES_FIT_COST
+
+
+def estimate_best_mandi_cost(state: str, commodity: str) -> float:
+    try:
+        state, commodity = resolve_name("state", state), resolve_name("commodity", commodity)
+        markets = markets_for_state_and_commodity(state, commodity)
+        return settings.cache_hit_cost + sum(
+            _series_cost(state, market, commodity) for market in markets
+        )
+    except (AmbiguousNameError, DataNotFoundError, FileNotFoundError, RuntimeError, ValueError):
+        return SERIES_FIT_COST
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController
+from app.core.dependencies import (
+    get_admission_controller,
+    get_dataset_version,
+    get_forecast_service,
+    require_api_key,
+)
+from app.core.exceptions import RateLimitError
+from app.main import app
+
+
+class AdmissionControllerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.controller = AdmissionController(capacity=2, refill_per_second=0, max_concurrent=1)
+
+    def test_refund_returns_tokens_up_to_capacity(self) -> None:
+        self.controller.admit("client", 2)
+        with self.assertRaises(RateLimitError):
+            self.controller.admit("client", 1)
+
+        self.controller.refund("client", 5)
+        self.assertEqual(self.controller.stats()["clients"]["client"], 2)
+
+    def test_saturated_forecast_spends_no_quota(self) -> None:
+        app.dependency_overrides[require_api_key] = lambda: "client"
+        app.dependency_overrides[get_dataset_version] = lambda: "v1"
+        app.dependency_overrides[get_admission_controller] = lambda: self.controller
+        app.dependency_overrides[get_forecast_service] = lambda: mock.Mock()
+        self.addCleanup(app.dependency_overrides.clear)
+        self.controller.admit("client", 0)
+
+        with mock.patch("app.main.estimate_forecast_cost", return_value=1.0), mock.patch(
+            "app.main._etag_name", side_effect=lambda kind, value: value
+        ), self.controller.forecast_slot():
+            response = TestClient(app).post("/forecast", json={"crop": "Wheat", "mandi": "Khanna"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.controller.stats()["clients"]["client"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
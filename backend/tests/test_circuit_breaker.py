@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from app.services import series_forecast
+from app.services.circuit_breaker import BreakerRegistry, CircuitBreaker
+from app.services.scheduler import ForecastScheduler, SchedulerFullError, TaskPreemptedError
+
+DECISION = {"name": "flaky", "reason": "test"}
+CACHE_KEY = ("v1", "state", "market", "commodity")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CircuitBreakerTransitionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = mock.patch("app.services.circuit_breaker.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("flaky", failure_threshold=3, reset_seconds=60)
+
+    def _open(self) -> None:
+        for _ in range(3):
+            self.breaker.record(healthy=False)
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        self.breaker.record(healthy=False)
+        self.breaker.record(healthy=False)
+        self.assertEqual(self.breaker.admit(), "closed")
+
+        self.breaker.record(healthy=False)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertIsNone(self.breaker.admit())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_success_resets_consecutive_failures(self) -> None:
+        self.breaker.record(healthy=False)
+        self.breaker.record(healthy=False)
+        self.breaker.record(healthy=True)
+        self.breaker.record(healthy=False)
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_admits_a_single_trial(self) -> None:
+        self._open()
+        self.clock.now += 59
+        self.assertIsNone(self.breaker.admit())
+
+        self.clock.now += 1
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertEqual(self.breaker.admit(), "trial")
+        self.assertIsNone(self.breaker.admit())
+
+    def test_healthy_trial_closes(self) -> None:
+        self._open()
+        self.clock.now += 60
+        self.assertEqual(self.breaker.admit(), "trial")
+
+        self.breaker.record(healthy=True)
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertEqual(self.breaker.admit(), "closed")
+
+    def test_failed_trial_reopens_for_a_full_reset_interval(self) -> None:
+        self._open()
+        self.clock.now += 60
+        self.assertEqual(self.breaker.admit(), "trial")
+
+        self.breaker.record(healthy=False)
+        self.assertEqual(self.breaker.state, "open")
+        self.clock.now += 59
+        self.assertIsNone(self.breaker.admit())
+        self.clock.now += 1
+        self.assertEqual(self.breaker.admit(), "trial")
+        self.assertEqual(self.breaker.stats()["opened"], 1)
+
+
+class TrialSubmissionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.registry = BreakerRegistry(failure_threshold=1, reset_seconds=60)
+        for patcher in (
+            mock.patch("app.services.circuit_breaker.time.monotonic", self.clock),
+            mock.patch.object(series_forecast, "fit_breakers", self.registry),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = self.registry.get("flaky")
+        self.breaker.record(healthy=False)
+        self.clock.now += 60
+
+    def _submit_with(
+        self, scheduler: ForecastScheduler | mock.Mock, bounded: bool = True
+    ) -> Future:
+        with mock.patch.object(series_forecast, "forecast_scheduler", scheduler):
+            return series_forecast._submit_fit("background", CACHE_KEY, DECISION, [], 7, bounded)
+
+    def _run_with_model(self, model, bounded: bool = True) -> Future:
+        with mock.patch.dict("app.services.model_registry.MODEL_REGISTRY", {"flaky": model}):
+            future = self._submit_with(ForecastScheduler(workers=1, max_queued=4), bounded)
+            future.exception(timeout=5)
+        return future
+
+    def _dropped(self, error: Exception) -> mock.Mock:
+        future: Future = Future()
+        future.set_exception(error)
+        return mock.Mock(submit=mock.Mock(return_value=future))
+
+    def test_preempted_trial_is_released(self) -> None:
+        future = self._submit_with(self._dropped(TaskPreemptedError("dropped")))
+
+        self.assertIsInstance(future.exception(), TaskPreemptedError)
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertEqual(self.breaker.admit(), "trial")
+
+    def test_rejected_trial_is_released(self) -> None:
+        self._submit_with(self._dropped(SchedulerFullError("full")))
+        self.assertEqual(self.breaker.admit(), "trial")
+
+    def test_trial_that_runs_and_fails_reopens(self) -> None:
+        def failing_model(history, periods):
+            raise RuntimeError("CmdStan failed to start")
+
+        future = self._run_with_model(failing_model)
+
+        self.assertIsInstance(future.exception(), RuntimeError)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertIsNone(self.breaker.admit())
+
+    def test_data_error_releases_the_trial_without_reopening(self) -> None:
+        def short_history(history, periods):
+            raise ValueError("Need at least 30 valid history rows")
+
+        future = self._run_with_model(short_history)
+
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertEqual(self.breaker.admit(), "trial")
+
+    def test_unbounded_fit_bypasses_the_breaker(self) -> None:
+        self.assertEqual(self.breaker.admit(), "trial")
+
+        def slow_but_healthy(history, periods):
+            return [{"yhat": 1.0}]
+
+        future = self._run_with_model(slow_but_healthy, bounded=False)
+
+        self.assertEqual(future.result()["forecast"], [{"yhat": 1.0}])
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertEqual(self.breaker.stats()["rejected"], 0)
+
+
+class DataErrorTests(unittest.TestCase):
+    def test_data_errors_do_not_count_against_the_model(self) -> None:
+        breaker = CircuitBreaker("flaky", failure_threshold=1, reset_seconds=60)
+
+        def short_history(history, periods):
+            raise ValueError("Need at least 30 valid history rows")
+
+        registry = {"flaky": short_history}
+        with mock.patch.dict("app.services.model_registry.MODEL_REGISTRY", registry):
+            with self.assertRaises(ValueError):
+                series_forecast._fit_series(CACHE_KEY, DECISION, [], 7, breaker)
+
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.failures, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
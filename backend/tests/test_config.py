@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest import mock
+
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+class RoutingLightModelTests(unittest.TestCase):
+    def test_registered_model_is_accepted(self) -> None:
+        with mock.patch.dict(os.environ, {"AGRIPULSE_ROUTING_LIGHT_MODEL": "seasonal_naive"}):
+            self.assertEqual(Settings().routing_light_model, "seasonal_naive")
+
+    def test_unknown_model_fails_at_load(self) -> None:
+        with mock.patch.dict(os.environ, {"AGRIPULSE_ROUTING_LIGHT_MODEL": "holtt"}):
+            with self.assertRaises(ValidationError) as raised:
+                Settings()
+
+        self.assertIn("AGRIPULSE_ROUTING_LIGHT_MODEL='holtt'", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
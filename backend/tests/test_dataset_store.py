@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from app.services import dataset_store
+from app.services.dataset_store import (
+    CUBE_DIR,
+    MappedPriceStore,
+    build_price_store,
+    open_price_store,
+    read_current_version,
+    save_partitioned_store,
+    save_price_store,
+)
+from app.services.price_cube import CUBE_ARRAYS
+
+
+def _store(version: str = "v1"):
+    days = np.arange("2024-01-01", "2024-01-11", dtype="datetime64[D]")
+    return build_price_store(
+        version=version,
+        dates=np.concatenate((days, days)),
+        prices=np.arange(20, dtype=np.float64) + 1000.0,
+        states=np.array(["Delhi"] * 10 + ["Punjab"] * 10),
+        markets=np.array(["Azadpur"] * 10 + ["Khanna"] * 10),
+        commodities=np.array(["Onion"] * 20),
+    )
+
+
+class MappedStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        self.store = _store()
+
+    def test_price_cube_is_published_and_mapped(self) -> None:
+        save_price_store(self.store, self.root)
+        opened = open_price_store(self.root)
+
+        self.assertIsInstance(opened, MappedPriceStore)
+        with mock.patch.object(dataset_store, "build_price_cube") as build:
+            cube = opened.price_cube
+        build.assert_not_called()
+        for name in CUBE_ARRAYS:
+            self.assertIsInstance(getattr(cube, name), np.memmap)
+            np.testing.assert_array_equal(getattr(cube, name), getattr(self.store.price_cube, name))
+        self.assertEqual(cube.states, self.store.price_cube.states)
+
+    def test_store_without_cube_rebuilds_it(self) -> None:
+        target = save_price_store(self.store, self.root)
+        shutil.rmtree(target / CUBE_DIR)
+
+        cube = open_price_store(self.root).price_cube
+        np.testing.assert_array_equal(cube.median, self.store.price_cube.median)
+
+    def test_warm_builds_derived_indexes(self) -> None:
+        self.store.warm()
+        self.assertIn("price_cube", vars(self.store))
+        self.assertIn("name_indexes", vars(self.store))
+
+
+class PublishTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+    def _entries(self) -> set[str]:
+        return {path.name for path in self.root.iterdir()}
+
+    def test_publish_swaps_current_and_leaves_no_staging(self) -> None:
+        first = save_price_store(_store("v1"), self.root)
+        second = save_price_store(_store("v2"), self.root)
+
+        self.assertTrue(second.name.startswith("v2-"))
+        self.assertEqual(read_current_version(self.root), second.name)
+        self.assertEqual(self._entries(), {"CURRENT", first.name, second.name})
+
+    def test_republish_leaves_attached_store_readable(self) -> None:
+        save_partitioned_store(_store("v1"), self.root, partition_by=("state",))
+        attached = open_price_store(self.root)
+
+        republished = save_partitioned_store(
+            _store("v1"), self.root, partition_by=("state", "commodity")
+        )
+        save_price_store(_store("v1"), self.root, keep=3)
+
+        self.assertNotEqual(attached.version, republished.name)
+        days, prices = attached.select("Onion", market="Azadpur")
+        self.assertEqual(len(days), 10)
+        self.assertEqual(float(prices[0]), 1000.0)
+
+    def test_prune_keeps_current_and_skips_staging_builds(self) -> None:
+        in_progress = self.root / ".v9.build.tmp"
+        in_progress.mkdir(parents=True)
+        (in_progress / dataset_store.MANIFEST_FILE).write_text("{}", encoding="utf-8")
+        for version in ("v1", "v2", "v3"):
+            latest = save_price_store(_store(version), self.root, keep=1)
+
+        self.assertEqual(self._entries(), {"CURRENT", latest.name, ".v9.build.tmp"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import unittest
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_dataset_version, get_forecast_service, require_api_key
+from app.main import app
+from app.services import series_forecast
+
+SERIES_KEY = ("v1", "delhi", "delhi azadpur", "onion")
+HISTORY = [
+    {"ds": datetime(2024, 1, 1) + timedelta(days=day), "y": 1000.0 + day}
+    for day in range(40)
+]
+POINTS = [
+    {
+        "ds": date(2024, 2, 10) + timedelta(days=day),
+        "yhat": 1040.0,
+        "yhat_lower": 1000.0,
+        "yhat_upper": 1080.0,
+    }
+    for day in range(7)
+]
+
+
+def _failed(error: Exception) -> Future:
+    future: Future = Future()
+    future.set_exception(error)
+    return future
+
+
+class ForecastFallbackTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(series_forecast, "series_cache_key", return_value=SERIES_KEY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(series_forecast.last_good_forecasts.clear)
+
+    def _forecast(self, future: Future, deadline: float | None = None) -> dict:
+        with mock.patch.object(series_forecast, "submit_series_forecast", return_value=future):
+            return series_forecast.forecast_series(
+                "Delhi", "Delhi Azadpur", "Onion", HISTORY, deadline=deadline, fallback=True
+            )
+
+    def test_failed_fit_serves_baseline(self) -> None:
+        result = self._forecast(_failed(RuntimeError("Prophet forecasting failed")))
+
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["model"]["name"], series_forecast.BASELINE_MODEL)
+        self.assertEqual(len(result["forecast"]), 7)
+
+    def test_missed_deadline_serves_last_good_forecast(self) -> None:
+        series_forecast.last_good_forecasts.put(
+            SERIES_KEY[1:], {"forecast": POINTS, "model": {"name": "prophet", "reason": "ok"}}
+        )
+        result = self._forecast(Future(), deadline=0.01)
+
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["model"]["name"], "prophet")
+        self.assertIn("deadline", result["model"]["reason"])
+        self.assertEqual(result["forecast"], POINTS)
+
+    def test_without_fallback_errors_propagate(self) -> None:
+        with mock.patch.object(
+            series_forecast, "submit_series_forecast", return_value=_failed(RuntimeError("boom"))
+        ):
+            with self.assertRaises(RuntimeError):
+                series_forecast.forecast_series("Delhi", "Delhi Azadpur", "Onion", HISTORY)
+
+
+class DegradedResponseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.degraded = True
+        app.dependency_overrides[require_api_key] = lambda: "test"
+        app.dependency_overrides[get_dataset_version] = lambda: "v1"
+        app.dependency_overrides[get_forecast_service] = lambda: self._pipeline
+        self.addCleanup(app.dependency_overrides.clear)
+        patcher = mock.patch("app.main.estimate_forecast_cost", return_value=1.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def _pipeline(self, payload, **_: object) -> dict:
+        return {
+            "crop": "Onion",
+            "mandi": "Delhi Azadpur",
+            "current_price": 1039.0,
+            "trend_direction": "flat",
+            "expected_change_pct": 0.0,
+            "recommendation": {
+                "action": "HOLD",
+                "expected_change_percent": 0.0,
+                "message": "Hold.",
+                "confidence": 50,
+                "risk_level": "LOW",
+            },
+            "volatility_level": "Low",
+            "shock_alert": None,
+            "forecast": POINTS,
+            "nearby_mandis": [],
+            "insights": [],
+            "language": "en",
+            "forecast_model": {"name": "naive", "reason": "Baseline forecast served."},
+            "degraded": self.degraded,
+        }
+
+    def _post(self):
+        return self.client.post("/forecast", json={"crop": "Onion", "mandi": "Delhi Azadpur"})
+
+    def test_degraded_response_is_not_cacheable(self) -> None:
+        response = self._post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["degraded"])
+        self.assertEqual(response.headers["cache-control"], "no-store")
+        self.assertNotIn("etag", response.headers)
+
+    def test_healthy_response_keeps_etag(self) -> None:
+        self.degraded = False
+        response = self._post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["degraded"])
+        self.assertIn("etag", response.headers)
+        self.assertIn("max-age", response.headers["cache-control"])
+
+
+if __name__ == "__main__":
+    unittest.main()
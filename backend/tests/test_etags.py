@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import (
+    get_dataset_version,
+    get_forecast_service,
+    get_mandi_comparison_service,
+    require_api_key,
+)
+from app.main import app
+from app.services import crop_prices
+from app.services.dataset_store import build_price_store
+
+DAYS = np.arange("2024-01-01", "2024-01-06", dtype="datetime64[D]")
+STORE = build_price_store(
+    version="v1",
+    dates=DAYS,
+    prices=np.full(len(DAYS), 1000.0),
+    states=np.repeat(["Punjab"], len(DAYS)),
+    markets=np.repeat(["Khanna"], len(DAYS)),
+    commodities=np.repeat(["Wheat"], len(DAYS)),
+)
+
+FORECAST = {
+    "crop": "Wheat",
+    "mandi": "Khanna",
+    "current_price": 1000.0,
+    "trend_direction": "flat",
+    "expected_change_pct": 0.0,
+    "recommendation": {
+        "action": "HOLD",
+        "expected_change_percent": 0.0,
+        "message": "Hold.",
+        "confidence": 50,
+        "risk_level": "LOW",
+    },
+    "volatility_level": "Low",
+    "shock_alert": None,
+    "forecast": [],
+    "nearby_mandis": [],
+    "insights": [],
+    "language": "en",
+    "forecast_model": {"name": "holt", "reason": "test"},
+    "degraded": False,
+}
+
+
+class ComparisonStub:
+    def __init__(self, failed_markets: int) -> None:
+        self.failed_markets = failed_markets
+
+    def select_best(self, state: str, commodity: str, **_: object) -> dict:
+        return {
+            "state": "Punjab",
+            "commodity": "Wheat",
+            "best_mandis": [{"mandi": "Khanna", "expected_change_percent": 1.5}],
+            "failed_markets": self.failed_markets,
+        }
+
+
+class CanonicalEtagTests(unittest.TestCase):
+    def setUp(self) -> None:
+        for patcher in (
+            mock.patch.object(crop_prices, "get_price_store", return_value=STORE),
+            mock.patch("app.main.estimate_forecast_cost", return_value=1.0),
+            mock.patch("app.main.estimate_best_mandi_cost", return_value=1.0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        app.dependency_overrides[require_api_key] = lambda: "test"
+        app.dependency_overrides[get_dataset_version] = lambda: "v1"
+        self.addCleanup(app.dependency_overrides.clear)
+        self.pipeline = mock.Mock(return_value=FORECAST)
+        app.dependency_overrides[get_forecast_service] = lambda: self.pipeline
+        self.client = TestClient(app)
+
+    def _best_mandi(self, failed_markets: int, **headers: str):
+        app.dependency_overrides[get_mandi_comparison_service] = lambda: ComparisonStub(
+            failed_markets
+        )
+        return self.client.get(
+            "/best-mandi", params={"state": "punjab", "commodity": "wheat"}, headers=headers
+        )
+
+    def test_forecast_etag_matches_across_spellings(self) -> None:
+        first = self.client.post("/forecast", json={"crop": "Wheat", "mandi": "Khanna"})
+        response = self.client.post(
+            "/forecast",
+            json={"crop": "wheat", "mandi": " KHANNA "},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.pipeline.call_count, 1)
+
+    def test_best_mandi_etag_matches_across_spellings(self) -> None:
+        etag = self._best_mandi(0).headers["etag"]
+        response = self.client.get(
+            "/best-mandi",
+            params={"state": "Punjab", "commodity": "Wheat"},
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_partial_ranking_is_not_cacheable(self) -> None:
+        response = self._best_mandi(1)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["cache-control"], "no-store")
+        self.assertNotIn("etag", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import unittest
+
+from app.services.forecast_cache import ForecastCache
+
+
+class ForecastCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ForecastCache(max_entries=2, ttl_seconds=60)
+
+    def test_get_returns_a_copy(self) -> None:
+        self.cache.put("key", {"forecast": [{"yhat": 1.0}]})
+
+        self.cache.get("key")["forecast"][0]["yhat"] = 99.0
+        self.assertEqual(self.cache.get("key"), {"forecast": [{"yhat": 1.0}]})
+
+    def test_put_stores_a_copy(self) -> None:
+        value = {"forecast": [{"yhat": 1.0}]}
+        self.cache.put("key", value)
+
+        value["forecast"].append({"yhat": 2.0})
+        self.assertEqual(len(self.cache.get("key")["forecast"]), 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+
+        self.assertTrue(self.cache.contains("a"))
+        self.assertFalse(self.cache.contains("b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import unittest
+
+from app.core.memory import AllocationTracer
+
+KEEP: list[bytearray] = []
+
+
+def _allocate() -> None:
+    KEEP.append(bytearray(4_000_000))
+
+
+class AllocationTracerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tracer = AllocationTracer()
+        self.addCleanup(self.tracer.stop)
+        self.addCleanup(KEEP.clear)
+
+    def _top_site(self, frames: int) -> dict:
+        self.tracer.snapshot(frames=frames)
+        _allocate()
+        return self.tracer.snapshot(limit=1)["top"][0]
+
+    def test_single_frame_reports_allocating_line(self) -> None:
+        site = self._top_site(frames=1)
+
+        self.assertIn("test_memory.py:11", site["location"])
+        self.assertNotIn("stack", site)
+
+    def test_deep_tracing_reports_call_stack(self) -> None:
+        site = self._top_site(frames=3)
+
+        self.assertIn("test_memory.py:11", site["location"])
+        self.assertEqual(site["stack"][0], site["location"])
+        self.assertIn("test_memory.py:22", site["stack"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_dataset_version, require_api_key
+from app.core.exceptions import AmbiguousNameError, UnknownNameError
+from app.main import app
+from app.services import crop_prices
+from app.services.dataset_store import build_price_store
+from app.services.name_index import NameIndex
+
+MARKETS = ("Khanna", "Delhi Azadpur", "Bilaspur North", "Bilaspur South")
+DAYS = np.arange("2024-01-01", "2024-01-06", dtype="datetime64[D]")
+STORE = build_price_store(
+    version="v1",
+    dates=np.tile(DAYS, len(MARKETS)),
+    prices=np.full(len(DAYS) * len(MARKETS), 1000.0),
+    states=np.repeat(["Punjab", "Delhi", "Punjab", "Punjab"], len(DAYS)),
+    markets=np.repeat(MARKETS, len(DAYS)),
+    commodities=np.repeat(["Potato", "Wheat", "Potato", "Potato"], len(DAYS)),
+)
+
+
+class NameIndexResolveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.markets = NameIndex("market", MARKETS)
+        self.crops = NameIndex("commodity", ("Potato", "Wheat"))
+
+    def test_exact_and_normalized_names_resolve(self) -> None:
+        self.assertEqual(self.markets.resolve("  delhi   AZADPUR "), "Delhi Azadpur")
+
+    def test_unique_whole_word_partial_resolves(self) -> None:
+        self.assertEqual(self.markets.resolve("azadpur"), "Delhi Azadpur")
+
+    def test_near_miss_never_resolves(self) -> None:
+        self.assertIsNone(self.crops.resolve("Tomato"))
+        self.assertIsNone(self.markets.resolve("Khana"))
+
+    def test_ambiguous_partial_does_not_resolve(self) -> None:
+        self.assertIsNone(self.markets.resolve("Bilaspur"))
+        self.assertEqual(
+            self.markets.partial_matches("Bilaspur"), ["Bilaspur North", "Bilaspur South"]
+        )
+
+
+class ResolveNameTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(crop_prices, "get_price_store", return_value=STORE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_near_miss_raises_with_suggestions(self) -> None:
+        with self.assertRaises(UnknownNameError) as raised:
+            crop_prices.resolve_name("commodity", "Tomato")
+        self.assertEqual(raised.exception.candidates, ["Potato"])
+
+    def test_ambiguous_partial_raises_with_candidates(self) -> None:
+        with self.assertRaises(AmbiguousNameError) as raised:
+            crop_prices.resolve_name("market", "Bilaspur")
+        self.assertEqual(raised.exception.candidates, ["Bilaspur North", "Bilaspur South"])
+
+    def test_unrelated_name_passes_through(self) -> None:
+        self.assertEqual(crop_prices.resolve_name("commodity", "Xylophone"), "Xylophone")
+
+
+class NameResolutionEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(crop_prices, "get_price_store", return_value=STORE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app.dependency_overrides[require_api_key] = lambda: "test"
+        app.dependency_overrides[get_dataset_version] = lambda: "v1"
+        self.addCleanup(app.dependency_overrides.clear)
+        self.client = TestClient(app)
+
+    def test_forecast_for_unknown_crop_is_not_found(self) -> None:
+        response = self.client.post("/forecast", json={"crop": "Tomato", "mandi": "Khanna"})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("Potato", response.json()["detail"])
+
+    def test_price_index_for_unknown_crop_is_not_found(self) -> None:
+        response = self.client.get("/price-index", params={"commodity": "Tomato"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_ambiguous_market_partial_is_a_conflict(self) -> None:
+        response = self.client.get("/history", params={"crop": "Potato", "mandi": "Bilaspur"})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["candidates"], ["Bilaspur North", "Bilaspur South"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_dataset_version, require_api_key
+from app.main import app
+from app.services import crop_prices, price_history
+from app.services.dataset_store import build_price_store
+
+DAYS = np.arange("2024-01-01", "2024-01-06", dtype="datetime64[D]")
+STORE = build_price_store(
+    version="v1",
+    dates=np.concatenate((DAYS, DAYS, DAYS)),
+    prices=np.array([100.0] * 5 + [200.0] * 5 + [300.0] * 5),
+    states=np.array(["Himachal Pradesh"] * 5 + ["Chhattisgarh"] * 10),
+    markets=np.array(["Bilaspur"] * 10 + ["Raipur"] * 5),
+    commodities=np.array(["Onion"] * 10 + ["Potato"] * 5),
+)
+
+
+class HistoryStateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        for module in (crop_prices, price_history):
+            patcher = mock.patch.object(module, "get_price_store", return_value=STORE)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        app.dependency_overrides[require_api_key] = lambda: "test"
+        app.dependency_overrides[get_dataset_version] = lambda: "v1"
+        self.addCleanup(app.dependency_overrides.clear)
+        self.client = TestClient(app)
+
+    def test_ambiguous_market_lists_candidate_states(self) -> None:
+        response = self.client.get("/history", params={"crop": "Onion", "mandi": "Bilaspur"})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["states"], ["Chhattisgarh", "Himachal Pradesh"])
+
+    def test_state_picks_one_series(self) -> None:
+        response = self.client.get(
+            "/history", params={"crop": "Onion", "mandi": "Bilaspur", "state": "chhattisgarh"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["state"], "Chhattisgarh")
+        self.assertEqual({point["price"] for point in response.json()["points"]}, {200.0})
+
+    def test_unique_market_needs_no_state(self) -> None:
+        result = price_history.query_price_history(crop="Potato", mandi="Raipur")
+
+        self.assertEqual(result["state"], "Chhattisgarh")
+        self.assertEqual(result["source_points"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app.services import price_updates
+from app.services.price_updates import PriceUpdateHub
+
+PAIR = ("Onion", "Delhi Azadpur")
+
+
+class PairUpdateTests(unittest.TestCase):
+    def test_unexpected_failure_becomes_error_update(self) -> None:
+        failing = mock.patch.object(
+            price_updates, "run_forecast_pipeline", side_effect=KeyError("forecast")
+        )
+        with mock.patch.object(price_updates, "dataset_version", return_value="v1"), failing:
+            with self.assertLogs("agripulse", level="ERROR"):
+                message = price_updates.pair_update(*PAIR)
+
+        self.assertEqual(message["type"], "error")
+        self.assertEqual((message["crop"], message["mandi"]), PAIR)
+        self.assertIn("retried", message["detail"])
+
+
+class PriceUpdateHubTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.hub = PriceUpdateHub(poll_seconds=60, max_pairs=2)
+
+    async def test_error_updates_are_not_reused(self) -> None:
+        error = {"type": "error", "crop": PAIR[0], "mandi": PAIR[1], "detail": "boom"}
+        with mock.patch.object(price_updates, "pair_update", return_value=error):
+            self.assertEqual(await self.hub._update(PAIR), error)
+            self.assertEqual(await self.hub._update(PAIR), error)
+
+        self.assertEqual(self.hub.computed, 2)
+        self.assertEqual(self.hub._updates, {})
+
+    async def test_error_to_full_queue_is_dropped(self) -> None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.hub.send_error(queue, "first")
+        self.hub.send_error(queue, "second")
+
+        self.assertEqual(queue.get_nowait()["detail"], "first")
+        self.assertEqual((self.hub.pushed, self.hub.dropped), (1, 1))
+
+    async def test_failed_update_is_not_cached(self) -> None:
+        with mock.patch.object(price_updates, "pair_update", side_effect=RuntimeError("boom")):
+            with self.assertLogs("agripulse", level="ERROR"):
+                with self.assertRaises(RuntimeError):
+                    await self.hub._update(PAIR)
+                await asyncio.sleep(0)
+
+        self.assertEqual(self.hub._updates, {})
+
+    async def test_spawned_tasks_are_held_and_failures_logged(self) -> None:
+        async def fail() -> None:
+            raise RuntimeError("watcher crashed")
+
+        with self.assertLogs("agripulse", level="ERROR") as logs:
+            task = self.hub._spawn(fail())
+            self.assertIn(task, self.hub._tasks)
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        self.assertNotIn(task, self.hub._tasks)
+        self.assertIn("Task failed", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+from app.services import sql_store
+from app.services.sql_store import read_sql_version
+
+
+def _write_version(path: Path, version: str) -> None:
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+
+
+class ReadSqlVersionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "prices.sqlite3"
+        self.addCleanup(self._close_cached)
+
+    def _close_cached(self) -> None:
+        cached = vars(sql_store._version_connections).pop("cached", None)
+        if cached is not None:
+            cached[1].close()
+
+    def test_missing_database_has_no_version(self) -> None:
+        self.assertIsNone(read_sql_version(self.path))
+
+    def test_reuses_the_thread_connection_and_sees_new_commits(self) -> None:
+        _write_version(self.path, "v1")
+        self.assertEqual(read_sql_version(self.path), "v1")
+        connection = sql_store._version_connections.cached[1]
+
+        _write_version(self.path, "v2")
+        self.assertEqual(read_sql_version(self.path), "v2")
+        self.assertIs(sql_store._version_connections.cached[1], connection)
+
+    def test_replaced_database_is_reopened(self) -> None:
+        _write_version(self.path, "v1")
+        self.assertEqual(read_sql_version(self.path), "v1")
+
+        replacement = self.path.with_name("next.sqlite3")
+        _write_version(replacement, "v2")
+        replacement.replace(self.path)
+        self.assertEqual(read_sql_version(self.path), "v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
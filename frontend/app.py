@@ -2,94 +2,202 @@ import os
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 
 API_BASE_URL = os.getenv("AGRIPULSE_API_BASE_URL", "http://127.0.0.1:8000").rstrip("/")
 API_KEY = os.getenv("AGRIPULSE_API_KEY", "agripulse-dev-key")
 FORECAST_API_URL = f"{API_BASE_URL}/forecast"
+BATCH_FORECAST_API_URL = f"{API_BASE_URL}/forecast/batch"
 HEALTH_API_URL = f"{API_BASE_URL}/health"
 REQUEST_HEADERS = {"X-API-Key": API_KEY}
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("AGRIPULSE_FRONTEND_CACHE_TTL", "300"))
+MAX_DASHBOARD_PAIRS = 50
+DEFAULT_DASHBOARD_PAIRS = "Wheat, Delhi Azadpur\nOnion, Delhi Azadpur\nPotato, Delhi Azadpur"
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    # One pooled keep-alive session shared across Streamlit reruns and users.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_forecast(
+    crop: str,
+    mandi: str,
+    district: str,
+    pincode: str,
+    days: int,
+    language: str,
+) -> dict:
+    payload = {
+        "crop": crop,
+        "mandi": mandi,
+        "district": district,
+        "pincode": pincode,
+        "days": days,
+        "language": language,
+    }
+    response = get_session().post(FORECAST_API_URL, json=payload, timeout=120)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_forecast_batch(
+    pairs: tuple[tuple[str, str], ...],
+    days: int,
+    language: str,
+) -> list[dict]:
+    payload = {
+        "items": [
+            {"crop": crop, "mandi": mandi, "days": days, "language": language}
+            for crop, mandi in pairs
+        ]
+    }
+    response = get_session().post(BATCH_FORECAST_API_URL, json=payload, timeout=300)
+    response.raise_for_status()
+    return response.json().get("results", [])
+
+
+def parse_pairs(text: str) -> tuple[tuple[str, str], ...]:
+    pairs: list[tuple[str, str]] = []
+    for line in text.splitlines():
+        crop, _, mandi = line.partition(",")
+        crop, mandi = crop.strip(), mandi.strip()
+        if crop and mandi and (crop, mandi) not in pairs:
+            pairs.append((crop, mandi))
+    return tuple(pairs[:MAX_DASHBOARD_PAIRS])
+
+
+def show_http_error(prefix: str, exc: requests.HTTPError) -> None:
+    status_code = exc.response.status_code if exc.response is not None else "unknown"
+    detail = ""
+    if exc.response is not None:
+        try:
+            detail = exc.response.json().get("detail", "")
+        except Exception:
+            detail = exc.response.text
+    st.error(f"{prefix} ({status_code}): {detail}")
+
+
+def render_forecast(data: dict) -> None:
+    recommendation = data.get("recommendation", {})
+    recommendation_action = recommendation.get("action", "N/A")
+    recommendation_message = recommendation.get(
+        "message", "No recommendation message available."
+    )
+    confidence = recommendation.get("confidence")
+    risk_level = recommendation.get("risk_level")
+
+    st.subheader("Recommendation")
+    st.success(f"{recommendation_action} | {recommendation_message}")
+    if confidence is not None and risk_level is not None:
+        st.write(f"Confidence: **{confidence}%** | Risk: **{risk_level}**")
+
+    st.write(f"Expected change: **{data['expected_change_pct']}%**")
+    st.write(f"Trend: **{data['trend_direction']}**")
+    st.write(f"Volatility: **{data['volatility_level']}**")
+
+    if data.get("shock_alert"):
+        st.warning(data["shock_alert"])
+
+    st.subheader("7-Day Forecast")
+    st.dataframe(data.get("forecast", []), use_container_width=True)
+
+    st.subheader("Nearby Mandis")
+    st.dataframe(data.get("nearby_mandis", []), use_container_width=True)
+
+    st.subheader("Insights")
+    for item in data.get("insights", []):
+        st.write(f"- {item}")
+
+
+def dashboard_row(item: dict) -> dict:
+    data = item.get("data") or {}
+    recommendation = data.get("recommendation", {})
+    return {
+        "Crop": item.get("crop"),
+        "Mandi": item.get("mandi"),
+        "Current Price": data.get("current_price"),
+        "Expected Change %": data.get("expected_change_pct"),
+        "Trend": data.get("trend_direction"),
+        "Action": recommendation.get("action"),
+        "Risk": recommendation.get("risk_level"),
+        "Shock Alert": data.get("shock_alert"),
+        "Error": item.get("detail") if item.get("status") != 200 else None,
+    }
+
 
 st.set_page_config(page_title="AgriPulse", page_icon="seedling", layout="wide")
 st.title("AgriPulse - Crop Price Intelligence")
 
-col1, col2 = st.columns(2)
-with col1:
-    crop = st.text_input("Crop", value="Wheat")
-    mandi = st.text_input("Mandi", value="Delhi Azadpur")
-    district = st.text_input("District", value="Delhi")
-with col2:
-    pincode = st.text_input("Pincode", value="110001")
-    days = st.slider("Forecast Days", min_value=1, max_value=7, value=7)
-    language = st.selectbox("Language", ["en", "hi"], index=0)
-
 with st.sidebar:
     st.caption(f"Backend: {API_BASE_URL}")
+    view = st.radio("View", ["Single Forecast", "Multi-Mandi Dashboard"])
     if st.button("Check Backend Health"):
         try:
-            health_response = requests.get(HEALTH_API_URL, timeout=10)
+            health_response = get_session().get(HEALTH_API_URL, timeout=10)
             health_response.raise_for_status()
             health = health_response.json()
             st.success(f"{health.get('service', 'service')} is {health.get('status', 'ok')}")
         except Exception as exc:
             st.error(f"Backend health check failed: {exc}")
+    if st.button("Clear Cached Results"):
+        fetch_forecast.clear()
+        fetch_forecast_batch.clear()
 
 
-if st.button("Get Forecast"):
-    payload = {
-        "crop": crop,
-        "mandi": mandi,
-        "district": district,
-        "pincode": pincode,
-        "days": days,
-        "language": language,
-    }
-    try:
-        response = requests.post(
-            FORECAST_API_URL,
-            json=payload,
-            headers=REQUEST_HEADERS,
-            timeout=120,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        recommendation = data.get("recommendation", {})
-        recommendation_action = recommendation.get("action", "N/A")
-        recommendation_message = recommendation.get(
-            "message", "No recommendation message available."
-        )
-        confidence = recommendation.get("confidence")
-        risk_level = recommendation.get("risk_level")
-
-        st.subheader("Recommendation")
-        st.success(f"{recommendation_action} | {recommendation_message}")
-        if confidence is not None and risk_level is not None:
-            st.write(f"Confidence: **{confidence}%** | Risk: **{risk_level}**")
-
-        st.write(f"Expected change: **{data['expected_change_pct']}%**")
-        st.write(f"Trend: **{data['trend_direction']}**")
-        st.write(f"Volatility: **{data['volatility_level']}**")
-
-        if data.get("shock_alert"):
-            st.warning(data["shock_alert"])
-
-        st.subheader("7-Day Forecast")
-        st.dataframe(data.get("forecast", []), use_container_width=True)
-
-        st.subheader("Nearby Mandis")
-        st.dataframe(data.get("nearby_mandis", []), use_container_width=True)
-
-        st.subheader("Insights")
-        for item in data.get("insights", []):
-            st.write(f"- {item}")
-    except requests.HTTPError as exc:
-        status_code = exc.response.status_code if exc.response is not None else "unknown"
-        detail = ""
-        if exc.response is not None:
+if view == "Single Forecast":
+    col1, col2 = st.columns(2)
+    with col1:
+        crop = st.text_input("Crop", value="Wheat")
+        mandi = st.text_input("Mandi", value="Delhi Azadpur")
+        district = st.text_input("District", value="Delhi")
+    with col2:
+        pincode = st.text_input("Pincode", value="110001")
+        days = st.slider("Forecast Days", min_value=1, max_value=7, value=7)
+        language = st.selectbox("Language", ["en", "hi"], index=0)
+
+    if st.button("Get Forecast"):
+        try:
+            with st.spinner("Fetching forecast..."):
+                data = fetch_forecast(crop, mandi, district, pincode, days, language)
+            render_forecast(data)
+        except requests.HTTPError as exc:
+            show_http_error("Forecast request failed", exc)
+        except Exception as exc:
+            st.error(f"Failed to fetch forecast: {exc}")
+else:
+    pairs_text = st.text_area(
+        f"Crop, Mandi pairs (one per line, up to {MAX_DASHBOARD_PAIRS})",
+        value=DEFAULT_DASHBOARD_PAIRS,
+        height=200,
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        days = st.slider("Forecast Days", min_value=1, max_value=7, value=7)
+    with col2:
+        language = st.selectbox("Language", ["en", "hi"], index=0)
+
+    if st.button("Load Dashboard"):
+        pairs = parse_pairs(pairs_text)
+        if not pairs:
+            st.warning("Enter at least one 'Crop, Mandi' line.")
+        else:
             try:
-                detail = exc.response.json().get("detail", "")
-            except Exception:
-                detail = exc.response.text
-        st.error(f"Forecast request failed ({status_code}): {detail}")
-    except Exception as exc:
-        st.error(f"Failed to fetch forecast: {exc}")
+                with st.spinner(f"Fetching {len(pairs)} forecasts..."):
+                    results = fetch_forecast_batch(pairs, days, language)
+                st.dataframe([dashboard_row(item) for item in results], use_container_width=True)
+                failed = sum(1 for item in results if item.get("status") != 200)
+                if failed:
+                    st.warning(f"{failed} of {len(results)} pairs could not be forecast.")
+            except requests.HTTPError as exc:
+                show_http_error("Dashboard request failed", exc)
+            except Exception as exc:
+                st.error(f"Failed to load dashboard: {exc}")